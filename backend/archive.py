@@ -0,0 +1,256 @@
+"""
+Streaming NDJSON export and import of the changelog archive.
+
+Usage (from the backend directory):
+    python archive.py export --output changelogs.ndjson.gz
+    python archive.py import changelogs.ndjson.gz
+"""
+import json
+import zlib
+import argparse
+import sys
+from datetime import datetime
+from typing import Iterable, Iterator, List, Dict, Any, Optional
+
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Changelog, init_db
+from repository_stats import RepositoryStatsTracker
+from config import settings
+
+EXPORT_COLUMNS = (
+    Changelog.id, Changelog.created_at, Changelog.title, Changelog.content,
+    Changelog.author, Changelog.repository, Changelog.commit_range,
+    Changelog.raw_commits, Changelog.published,
+)
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class ArchiveImportError(Exception):
+    """Raised when an import line cannot be parsed"""
+    pass
+
+
+def iter_export_lines(db: Session, published_only: bool = False, batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """Yield one NDJSON line per changelog, reading rows from the database in batches"""
+    query = select(*EXPORT_COLUMNS).order_by(Changelog.id)
+    if published_only:
+        query = query.where(Changelog.published == True)
+
+    result = db.execute(query.execution_options(yield_per=batch_size or settings.ARCHIVE_BATCH_SIZE))
+    for row in result:
+        record = row._asdict()
+        record["created_at"] = record["created_at"].isoformat() if record["created_at"] else None
+        yield (json.dumps(record) + "\n").encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip-compress a stream of byte chunks incrementally"""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _row_from_record(record: Any, preserve_ids: bool) -> Dict[str, Any]:
+    if not isinstance(record, dict):
+        raise ArchiveImportError(f"Expected a JSON object, got {type(record).__name__}")
+
+    missing = [key for key in ("content", "repository", "commit_range") if not record.get(key)]
+    if missing:
+        raise ArchiveImportError(f"Missing required fields: {', '.join(missing)}")
+    invalid = [
+        key for key in ("title", "content", "author", "repository", "commit_range", "created_at")
+        if record.get(key) is not None and not isinstance(record[key], str)
+    ]
+    if invalid:
+        raise ArchiveImportError(f"Expected strings for: {', '.join(invalid)}")
+    if preserve_ids and record.get("id") is not None and not isinstance(record["id"], int):
+        raise ArchiveImportError("Expected an integer id")
+
+    row = {
+        "title": record.get("title"),
+        "content": record["content"],
+        "author": record.get("author") or "system",
+        "repository": record["repository"],
+        "commit_range": record["commit_range"],
+        "raw_commits": record.get("raw_commits"),
+        "published": bool(record.get("published", False)),
+    }
+    if record.get("created_at"):
+        row["created_at"] = datetime.fromisoformat(record["created_at"])
+    if preserve_ids and record.get("id") is not None:
+        row["id"] = record["id"]
+    return row
+
+
+class ChangelogImporter:
+    """Parses NDJSON lines and bulk inserts them in fixed-size batches"""
+
+    def __init__(self, db: Session, preserve_ids: bool = False, batch_size: Optional[int] = None):
+        self.db = db
+        self.preserve_ids = preserve_ids
+        self.batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        self.imported = 0
+        self.repositories = set()
+        self._line_number = 0
+        self._batch: List[Dict[str, Any]] = []
+        self._stats = RepositoryStatsTracker()
+
+    def add_line(self, line: bytes):
+        self._line_number += 1
+        line = line.strip()
+        if not line:
+            return
+        try:
+            row = _row_from_record(json.loads(line), self.preserve_ids)
+        except (ValueError, TypeError, ArchiveImportError) as e:
+            raise ArchiveImportError(f"Line {self._line_number}: {str(e)}")
+
+        self._batch.append(row)
+        self.repositories.add(row["repository"])
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._batch:
+            return
+        self.db.execute(insert(Changelog), self._batch)
+        for row in self._batch:
+            self._stats.add_row(row)
+        self._stats.apply(self.db)
+        self.db.commit()
+        self.imported += len(self._batch)
+        self._batch = []
+
+
+class LineSplitter:
+    """
+    Reassembles lines from arbitrarily chunked, optionally gzip'd bytes.
+
+    The unfinished line is kept as a list of chunks and only joined once its
+    newline arrives; lines longer than ARCHIVE_MAX_LINE_BYTES are rejected.
+    """
+
+    def __init__(self, max_line_bytes: Optional[int] = None):
+        self.max_line_bytes = max_line_bytes or settings.ARCHIVE_MAX_LINE_BYTES
+        self._partial: List[bytes] = []
+        self._partial_size = 0
+        self._decompressor = None
+        self._head: Optional[bytes] = b""  # start of the stream until gzip detection, then None
+
+    def _check(self, size: int):
+        if size > self.max_line_bytes:
+            raise ArchiveImportError(f"Line longer than {self.max_line_bytes} bytes")
+
+    def _split(self, chunk: bytes, final: bool = False) -> List[bytes]:
+        if b"\n" not in chunk and not final:
+            self._partial.append(chunk)
+            self._partial_size += len(chunk)
+            self._check(self._partial_size)
+            return []
+
+        lines = chunk.split(b"\n")
+        lines[0] = b"".join(self._partial) + lines[0]
+        rest = b"" if final else lines.pop()
+        self._partial = [rest] if rest else []
+        self._partial_size = len(rest)
+        self._check(max(len(line) for line in lines + [rest]))
+        return lines
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        if self._head is not None:
+            chunk = self._head + chunk
+            if len(chunk) < len(GZIP_MAGIC):
+                self._head = chunk
+                return []
+            self._head = None
+            if chunk.startswith(GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(wbits=31)
+        if self._decompressor:
+            chunk = self._decompressor.decompress(chunk)
+        return self._split(chunk)
+
+    def finish(self) -> List[bytes]:
+        if self._head is not None:
+            chunk, self._head = self._head, None
+        else:
+            chunk = self._decompressor.flush() if self._decompressor else b""
+        return self._split(chunk, final=True)
+
+
+def _export_command(args):
+    db = SessionLocal()
+    try:
+        lines = iter_export_lines(db, args.published_only, args.batch_size)
+        chunks = gzip_chunks(lines) if args.gzip or args.output.endswith(".gz") else lines
+        out = open(args.output, "wb") if args.output != "-" else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    finally:
+        db.close()
+
+
+def _import_command(args):
+    init_db()
+    db = SessionLocal()
+    try:
+        importer = ChangelogImporter(db, args.preserve_ids, args.batch_size)
+        source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+        splitter = LineSplitter()
+        try:
+            while True:
+                chunk = source.read(1 << 16)
+                if not chunk:
+                    break
+                for line in splitter.feed(chunk):
+                    importer.add_line(line)
+            for line in splitter.finish():
+                importer.add_line(line)
+            importer.flush()
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+    except ArchiveImportError as e:
+        db.rollback()
+        sys.exit(f"Import failed: {str(e)}")
+    finally:
+        db.close()
+
+    if importer.imported:
+        from static_publisher import publish_all
+        publish_all()
+    print(f"Imported {importer.imported} changelogs", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import the changelog archive as NDJSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Stream all changelogs to an NDJSON file")
+    export_parser.add_argument("--output", "-o", default="-", help="Output file, '-' for stdout")
+    export_parser.add_argument("--gzip", action="store_true", help="Gzip the output (implied by a .gz filename)")
+    export_parser.add_argument("--published-only", action="store_true")
+    export_parser.add_argument("--batch-size", type=int, default=None)
+    export_parser.set_defaults(func=_export_command)
+
+    import_parser = subparsers.add_parser("import", help="Bulk import changelogs from an NDJSON file (gzip detected)")
+    import_parser.add_argument("input", help="Input file, '-' for stdin")
+    import_parser.add_argument("--preserve-ids", action="store_true", help="Keep the exported changelog ids")
+    import_parser.add_argument("--batch-size", type=int, default=None)
+    import_parser.set_defaults(func=_import_command)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, HTTPException, Request, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from database import SessionLocal
+from archive import iter_export_lines, gzip_chunks, ChangelogImporter, LineSplitter, ArchiveImportError
+from auth_middleware import get_authenticated_user_token
+from static_publisher import publish_all
+from timing import TimedRoute
+
+router = APIRouter(prefix="/api/v1/changelogs", tags=["Archive"], route_class=TimedRoute)
+
+
+def _import_lines(importer: ChangelogImporter, lines, finish: bool = False):
+    for line in lines:
+        importer.add_line(line)
+    if finish:
+        importer.flush()
+
+
+@router.get("/export")
+async def export_changelogs(request: Request, gzip: bool = False, published_only: bool = False):
+    """Stream the changelog archive as NDJSON, optionally gzip'd"""
+    get_authenticated_user_token(request)
+
+    def generate():
+        db = SessionLocal()
+        try:
+            lines = iter_export_lines(db, published_only)
+            yield from gzip_chunks(lines) if gzip else lines
+        finally:
+            db.close()
+
+    filename = "changelogs.ndjson.gz" if gzip else "changelogs.ndjson"
+    return StreamingResponse(
+        iterate_in_threadpool(generate()),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/import")
+async def import_changelogs(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    preserve_ids: bool = False
+):
+    """
+    Bulk import changelogs from an NDJSON request body (plain or gzip'd), in batches.
+
+    Parsing and database writes run in the threadpool so large archives do not
+    block the event loop.
+    """
+    get_authenticated_user_token(request)
+
+    db = SessionLocal()
+    importer = ChangelogImporter(db, preserve_ids)
+    splitter = LineSplitter()
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(_import_lines, importer, splitter.feed(chunk))
+        await run_in_threadpool(_import_lines, importer, splitter.finish(), True)
+    except ArchiveImportError as e:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Import stopped after {importer.imported} changelogs: {str(e)}"
+        )
+    except Exception as e:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Import failed after {importer.imported} changelogs: {str(e)}"
+        )
+    finally:
+        db.close()
+
+    if importer.imported:
+        background_tasks.add_task(publish_all)
+
+    return {
+        "status": "success",
+        "imported": importer.imported,
+        "repositories": len(importer.repositories)
+    }
@@ -0,0 +1,216 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field, field_validator
+import asyncio
+import json
+import logging
+
+from database import SessionLocal, Changelog
+from commit_service import commit_service
+from diff_filter import diff_filter_for
+from github_api import RateLimitBudget
+from changelog_generator import build_prompt, generate_changelog_content
+from llm_backend import llm_client
+from static_publisher import publish_changelog
+from repository_stats import RepositoryStatsTracker
+from auth_middleware import get_authenticated_user_token
+from config import settings
+from timing import TimedRoute
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/changelogs", tags=["Batch"], route_class=TimedRoute)
+
+
+class BatchGenerateRequest(BaseModel):
+    repositories: List[str]  # owner/repo format
+    since_date: Optional[str] = None
+    until_date: Optional[str] = None
+    max_commits: Optional[int] = Field(50, ge=1, le=settings.MAX_FETCH_COMMITS)
+    github_budget: Optional[int] = Field(None, ge=1)
+    save: bool = True
+    published: bool = True
+
+    @field_validator("repositories")
+    @classmethod
+    def validate_repositories(cls, repositories: List[str]) -> List[str]:
+        if not repositories:
+            raise ValueError("At least one repository is required")
+        for repository in repositories:
+            owner, _, repo = repository.partition("/")
+            if not owner or not repo or "/" in repo:
+                raise ValueError(f"Invalid repository '{repository}', expected owner/repo")
+        return list(dict.fromkeys(repositories))
+
+
+def _commit_range(request: BatchGenerateRequest) -> str:
+    parts = []
+    if request.since_date:
+        parts.append(f"since: {request.since_date}")
+    if request.until_date:
+        parts.append(f"until: {request.until_date}")
+    return ", ".join(parts) or "latest commits"
+
+
+def _event(event: str, **data) -> bytes:
+    return (json.dumps({"event": event, **data}) + "\n").encode()
+
+
+async def _process_repository(
+    repository: str,
+    request: BatchGenerateRequest,
+    user_token: str,
+    budget: RateLimitBudget,
+    fetch_limit: asyncio.Semaphore,
+    llm_limit: asyncio.Semaphore,
+    events: asyncio.Queue
+) -> Optional[Dict[str, Any]]:
+    """Fetch, filter and generate the changelog of one repository, reporting progress on the queue"""
+    owner, repo = repository.split("/", 1)
+    try:
+        await events.put(_event("started", repository=repository))
+
+        diff_filter = diff_filter_for(repository)
+        async with fetch_limit:
+            records = await commit_service.fetch_commits_with_details(
+                owner=owner,
+                repo=repo,
+                since_date=request.since_date,
+                until_date=request.until_date,
+                max_commits=request.max_commits or 50,
+                user_token=user_token,
+                diff_filter=diff_filter,
+                budget=budget
+            )
+        commits = [record.to_dict() for record in records]
+        await events.put(_event(
+            "fetched",
+            repository=repository,
+            count=len(commits),
+            filter_stats=diff_filter.stats.to_dict()
+        ))
+
+        if not commits:
+            await events.put(_event("skipped", repository=repository, reason="No commits in range"))
+            return None
+
+        prompt, collapse_stats = build_prompt(repository, commits)
+        async with llm_limit:
+            content = await generate_changelog_content(prompt)
+        await events.put(_event("generated", repository=repository, collapse_stats=collapse_stats))
+
+        return {"repository": repository, "content": content, "commits": commits}
+
+    except Exception as e:
+        logger.error(f"Batch generation failed for {repository}: {str(e)}")
+        await events.put(_event("failed", repository=repository, error=str(e)))
+        return None
+
+
+def _save_results(results: List[Dict[str, Any]], request: BatchGenerateRequest) -> Dict[str, int]:
+    """Save all generated changelogs in a single transaction"""
+    db = SessionLocal()
+    try:
+        changelogs = [
+            Changelog(
+                title=f"{result['repository']} changelog ({_commit_range(request)})",
+                content=result["content"],
+                author="system",
+                repository=result["repository"],
+                commit_range=_commit_range(request),
+                raw_commits=result["commits"],
+                published=request.published
+            )
+            for result in results
+        ]
+        db.add_all(changelogs)
+        stats = RepositoryStatsTracker()
+        for changelog in changelogs:
+            stats.add(changelog)
+        stats.apply(db)
+        db.commit()
+        return {changelog.repository: changelog.id for changelog in changelogs}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@router.post("/batch")
+async def batch_generate(batch_request: BatchGenerateRequest, request: Request):
+    """
+    Generate changelogs for several repositories concurrently.
+
+    Streams newline-delimited JSON progress events per repository, then saves
+    every generated changelog in one transaction.
+    """
+    if not llm_client.configured:
+        raise HTTPException(status_code=500, detail="LLM backend not configured")
+
+    user_token = get_authenticated_user_token(request)
+
+    budget = RateLimitBudget(
+        # Callers may ask for a smaller budget, never a larger one
+        max_requests=min(batch_request.github_budget or settings.BATCH_GITHUB_BUDGET, settings.BATCH_GITHUB_BUDGET),
+        concurrency=settings.BATCH_GITHUB_CONCURRENCY
+    )
+    fetch_limit = asyncio.Semaphore(settings.BATCH_REPO_CONCURRENCY)
+    llm_limit = asyncio.Semaphore(settings.BATCH_LLM_CONCURRENCY)
+
+    async def stream():
+        events: asyncio.Queue = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(_process_repository(
+                repository, batch_request, user_token, budget, fetch_limit, llm_limit, events
+            ))
+            for repository in batch_request.repositories
+        ]
+        all_done = asyncio.create_task(asyncio.wait(tasks))
+
+        try:
+            while True:
+                getter = asyncio.create_task(events.get())
+                done, _ = await asyncio.wait({getter, all_done}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    yield getter.result()
+                    continue
+                getter.cancel()
+                break
+
+            while not events.empty():
+                yield events.get_nowait()
+
+            results = [task.result() for task in tasks if task.result()]
+            summary = {
+                "requested": len(batch_request.repositories),
+                "generated": len(results),
+                "github_requests": budget.used
+            }
+
+            if not batch_request.save or not results:
+                yield _event("completed", **summary, changelogs={
+                    result["repository"]: result["content"] for result in results
+                })
+                return
+
+            try:
+                changelog_ids = await asyncio.to_thread(_save_results, results, batch_request)
+            except Exception as e:
+                yield _event("failed", error=f"Failed to save changelogs: {str(e)}", **summary)
+                return
+
+            if batch_request.published:
+                for repository, changelog_id in changelog_ids.items():
+                    await asyncio.to_thread(publish_changelog, changelog_id, repository)
+
+            yield _event("completed", **summary, changelog_ids=changelog_ids)
+        finally:
+            # Stop outstanding work if the client disconnects
+            for task in tasks:
+                task.cancel()
+            all_done.cancel()
+
+    # Progress events must reach the client as they happen, not when a compression buffer fills
+    return StreamingResponse(stream(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
@@ -0,0 +1,269 @@
+"""
+Local stand-in for the GitHub REST API and the OpenAI chat completions API.
+
+Serves deterministic synthetic data with configurable latency and GitHub-style
+rate-limit headers so the backend's hot paths can be measured offline.
+"""
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class MockConfig:
+    """Tunable behaviour of the mock upstream"""
+
+    def __init__(
+        self,
+        github_latency_ms: float = 20.0,
+        openai_latency_ms: float = 200.0,
+        openai_error_rate: float = 0.0,
+        openai_slow_rate: float = 0.0,
+        openai_slow_latency_ms: float = 2000.0,
+        rate_limit: int = 5000,
+        files_per_commit: int = 4,
+        patch_lines: int = 200,
+        total_commits: int = 1000
+    ):
+        self.github_latency_ms = github_latency_ms
+        self.openai_latency_ms = openai_latency_ms
+        self.openai_error_rate = openai_error_rate  # fraction of completions answered with a 503
+        self.openai_slow_rate = openai_slow_rate  # fraction of completions delayed to openai_slow_latency_ms
+        self.openai_slow_latency_ms = openai_slow_latency_ms
+        self.rate_limit = rate_limit
+        self.files_per_commit = files_per_commit
+        self.patch_lines = patch_lines
+        self.total_commits = total_commits
+
+
+def _sha(index: int) -> str:
+    return hashlib.sha1(f"commit-{index}".encode()).hexdigest()
+
+
+def _commit_summary(owner: str, repo: str, index: int) -> Dict[str, Any]:
+    sha = _sha(index)
+    return {
+        "sha": sha,
+        "html_url": f"https://github.com/{owner}/{repo}/commit/{sha}",
+        "commit": {
+            "message": f"Change number {index}",
+            "author": {
+                "name": "Bench Author",
+                "email": "bench@example.com",
+                "date": f"2024-01-{index % 28 + 1:02d}T12:00:00Z"
+            }
+        },
+        "parents": [{"sha": _sha(index + 1)}]
+    }
+
+
+def _commit_detail(owner: str, repo: str, index: int, config: MockConfig) -> Dict[str, Any]:
+    rng = random.Random(index)
+    messages = [
+        "Add {0} support to the API",
+        "Fix crash when {0} is empty",
+        "Refactor {0} handling",
+        "fix typo",
+        "Bump {0} from 1.{1}.0 to 1.{2}.0",
+    ]
+    topics = ["login", "search", "export", "billing", "settings", "webhooks", "cache"]
+    topic = rng.choice(topics)
+    message = rng.choice(messages).format(topic, index, index + 1)
+
+    files = []
+    for n in range(config.files_per_commit):
+        filename = rng.choice([
+            f"src/{topic}/module_{n}.py",
+            f"src/{topic}/handlers.py",
+            "package-lock.json",
+            f"dist/{topic}.min.js",
+            f"tests/test_{topic}.py",
+        ])
+        patch = "\n".join(
+            f"{'+' if i % 3 else '-'}    value_{i} = compute_{topic}({i})"
+            for i in range(config.patch_lines)
+        )
+        files.append({
+            "filename": filename,
+            "status": "modified",
+            "additions": config.patch_lines * 2 // 3,
+            "deletions": config.patch_lines // 3,
+            "changes": config.patch_lines,
+            "patch": f"@@ -1,{config.patch_lines} +1,{config.patch_lines} @@\n{patch}"
+        })
+
+    detail = _commit_summary(owner, repo, index)
+    detail["commit"]["message"] = message
+    detail["stats"] = {
+        "additions": sum(f["additions"] for f in files),
+        "deletions": sum(f["deletions"] for f in files),
+        "total": sum(f["changes"] for f in files)
+    }
+    detail["files"] = files
+    return detail
+
+
+def create_mock_app(config: Optional[MockConfig] = None) -> FastAPI:
+    """Build the mock GitHub + OpenAI ASGI app"""
+    config = config or MockConfig()
+    app = FastAPI(title="Mock GitHub and OpenAI")
+    state = {"remaining": config.rate_limit, "reset": int(time.time()) + 3600}
+    index_by_sha = {_sha(i): i for i in range(config.total_commits)}
+
+    async def github_response(payload: Any, status_code: int = 200) -> JSONResponse:
+        await asyncio.sleep(config.github_latency_ms / 1000)
+        if state["remaining"] <= 0:
+            status_code, payload = 403, {"message": "API rate limit exceeded"}
+        else:
+            state["remaining"] -= 1
+        return JSONResponse(payload, status_code=status_code, headers={
+            "X-RateLimit-Limit": str(config.rate_limit),
+            "X-RateLimit-Remaining": str(max(state["remaining"], 0)),
+            "X-RateLimit-Reset": str(state["reset"]),
+            "X-RateLimit-Resource": "core",
+        })
+
+    @app.get("/user")
+    async def user():
+        return await github_response({"login": "bench", "id": 1, "avatar_url": ""})
+
+    @app.get("/user/repos")
+    async def user_repos():
+        return await github_response([
+            {
+                "name": f"repo{i}",
+                "full_name": f"bench/repo{i}",
+                "description": None,
+                "language": "Python",
+                "updated_at": "2024-01-01T00:00:00Z",
+                "private": False,
+                "default_branch": "main",
+                "permissions": {"admin": True}
+            }
+            for i in range(30)
+        ])
+
+    @app.get("/repos/{owner}/{repo}")
+    async def repository(owner: str, repo: str):
+        return await github_response({
+            "name": repo,
+            "full_name": f"{owner}/{repo}",
+            "default_branch": "main",
+            "private": False
+        })
+
+    @app.get("/repos/{owner}/{repo}/commits")
+    async def commits(owner: str, repo: str, per_page: int = 30, page: int = 1):
+        start = (page - 1) * per_page
+        end = min(start + per_page, config.total_commits)
+        return await github_response([_commit_summary(owner, repo, i) for i in range(start, end)])
+
+    @app.get("/repos/{owner}/{repo}/commits/{sha}")
+    async def commit_detail(owner: str, repo: str, sha: str):
+        if sha not in index_by_sha:
+            return await github_response({"message": "Not Found"}, status_code=404)
+        return await github_response(_commit_detail(owner, repo, index_by_sha[sha], config))
+
+    @app.get("/repos/{owner}/{repo}/compare/{basehead}")
+    async def compare(owner: str, repo: str, basehead: str):
+        base, _, head = basehead.partition("...")
+        start = index_by_sha.get(head, 0)
+        end = index_by_sha.get(base, min(start + 50, config.total_commits))
+        details = [_commit_detail(owner, repo, i, config) for i in range(start, end)]
+        return await github_response({
+            "status": "ahead",
+            "total_commits": len(details),
+            "commits": [_commit_summary(owner, repo, i) for i in range(start, end)],
+            "files": [f for d in details for f in d["files"]]
+        })
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        slow = random.random() < config.openai_slow_rate
+        await asyncio.sleep((config.openai_slow_latency_ms if slow else config.openai_latency_ms) / 1000)
+        if random.random() < config.openai_error_rate:
+            return JSONResponse({"error": {"message": "Synthetic overload"}}, status_code=503)
+        prompt_chars = sum(len(m.get("content", "")) for m in body.get("messages", []))
+        content = "## Features\n- Synthetic changelog entry\n\n## Bug Fixes\n- Synthetic fix\n"
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (prompt_chars + len(content)) // 4
+            }
+        }
+
+    return app
+
+
+class MockServer:
+    """Runs the mock app with uvicorn on a background thread"""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        import socket
+        import uvicorn
+
+        if port == 0:
+            with socket.socket() as sock:
+                sock.bind((host, 0))
+                port = sock.getsockname()[1]
+
+        self.host = host
+        self.port = port
+        self._server = uvicorn.Server(uvicorn.Config(
+            create_mock_app(config), host=host, port=port, log_level="warning"
+        ))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "MockServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the mock GitHub/OpenAI server")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--github-latency-ms", type=float, default=20.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=200.0)
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--openai-slow-rate", type=float, default=0.0)
+    parser.add_argument("--openai-slow-latency-ms", type=float, default=2000.0)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    args = parser.parse_args()
+
+    uvicorn.run(create_mock_app(MockConfig(
+        github_latency_ms=args.github_latency_ms,
+        openai_latency_ms=args.openai_latency_ms,
+        openai_error_rate=args.openai_error_rate,
+        openai_slow_rate=args.openai_slow_rate,
+        openai_slow_latency_ms=args.openai_slow_latency_ms,
+        rate_limit=args.rate_limit
+    )), host="127.0.0.1", port=args.port)
@@ -0,0 +1,253 @@
+"""
+Scenario benchmarks for the changelog backend, run fully offline.
+
+Usage (from the backend directory):
+    python -m benchmarks.run_benchmarks --output bench_results.json
+
+The backend is pointed at a local mock GitHub/OpenAI server and a temporary
+SQLite database before any application module is imported.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Awaitable, Dict, Any, List, Optional
+
+from benchmarks.mock_upstream import MockConfig, MockServer
+
+BENCH_OWNER = "bench"
+BENCH_REPO = "repo0"
+
+
+def configure_environment(mock_url: str, database_path: str):
+    """Point the backend at the mock upstream; must run before importing app modules"""
+    os.environ["GITHUB_API_BASE_URL"] = mock_url
+    os.environ["GITHUB_TOKEN"] = "bench-token"
+    os.environ["OPENAI_API_BASE_URL"] = f"{mock_url}/v1"
+    os.environ["OPENAI_API_KEY"] = "bench-key"
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+
+
+def summarise(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "iterations": len(samples),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+async def measure(
+    fn: Callable[[], Awaitable[Dict[str, Any]]],
+    iterations: int,
+    warmup: int = 1,
+    setup: Optional[Callable[[], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run a scenario repeatedly and return timing statistics plus the last run's extra info.
+
+    setup runs untimed before every iteration, e.g. to reset caches.
+    """
+    extra: Dict[str, Any] = {}
+    for _ in range(warmup):
+        if setup:
+            setup()
+        await fn()
+
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        extra = await fn() or {}
+        samples.append(time.perf_counter() - start)
+
+    return {**summarise(samples), **extra}
+
+
+def seed_changelogs(rows: int, batch_size: int = 5000):
+    """Bulk insert synthetic changelogs into the benchmark database"""
+    from sqlalchemy import insert
+    from database import SessionLocal, Changelog
+
+    content = "## Features\n" + "\n".join(f"- Feature line {i}" for i in range(40))
+    start = datetime(2024, 1, 1)
+    db = SessionLocal()
+    try:
+        for offset in range(0, rows, batch_size):
+            db.execute(insert(Changelog), [
+                {
+                    "title": f"Release {i}",
+                    "content": content,
+                    "author": "system",
+                    "repository": f"bench/repo{i % 200}",
+                    "commit_range": "since: 2024-01-01",
+                    "raw_commits": [],
+                    "published": i % 2 == 0,
+                    "created_at": start + timedelta(minutes=i),
+                }
+                for i in range(offset, min(offset + batch_size, rows))
+            ])
+            db.commit()
+    finally:
+        db.close()
+
+
+async def run(args) -> Dict[str, Any]:
+    import httpx
+    from auth_routes import sessions
+    from commit_cache import clear_commit_cache
+    from commit_collapse import collapse_commits
+    from commit_service import commit_service
+    from diff_filter import diff_filter_for
+    from main import app
+
+    # Authenticate benchmark requests with an injected session
+    sessions["bench-session"] = {
+        "user": {"id": 1, "login": "bench", "avatar_url": "", "authenticated": True},
+        "access_token": "bench-token",
+        "created_at": time.time()
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    results: Dict[str, Any] = {}
+    selected = set(args.scenarios)
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        cookies={"session_id": "bench-session"},
+        timeout=None
+    ) as client:
+
+        async def fetch(count: int) -> Dict[str, Any]:
+            response = await client.post("/api/v1/changelogs/fetch-commits", json={
+                "owner": BENCH_OWNER, "repo": BENCH_REPO, "max_commits": count
+            })
+            response.raise_for_status()
+            return {
+                "commits_requested": count,
+                "commits_returned": response.json()["count"],
+                "response_bytes": len(response.content)
+            }
+
+        commits: List[Dict[str, Any]] = []
+        # Cold runs clear the commit cache so every commit is fetched from GitHub;
+        # warm runs are served from the cache after the warmup iteration
+        for count in (10, 100, 500):
+            for name, setup in ((f"fetch_commits_{count}", clear_commit_cache), (f"fetch_commits_{count}_warm", None)):
+                if name in selected:
+                    results[name] = await measure(lambda: fetch(count), args.iterations, setup=setup)
+                    print(f"{name}: {results[name]['median_ms']} ms median", file=sys.stderr)
+
+        if selected & {"prompt_build", "generate"}:
+            response = await client.post("/api/v1/changelogs/fetch-commits", json={
+                "owner": BENCH_OWNER, "repo": BENCH_REPO, "max_commits": 100
+            })
+            commits = response.json()["commits"]
+
+        if "prompt_build" in selected:
+            async def prompt_build() -> Dict[str, Any]:
+                collapsed = collapse_commits(commits)
+                diff_filter = diff_filter_for(f"{BENCH_OWNER}/{BENCH_REPO}")
+                prompt = commit_service.format_commits_for_ai(collapsed.commits, diff_filter, collapsed.notes)
+                return {"input_commits": len(commits), "prompt_chars": len(prompt)}
+
+            results["prompt_build"] = await measure(prompt_build, args.iterations * 10)
+            print(f"prompt_build: {results['prompt_build']['median_ms']} ms median", file=sys.stderr)
+
+        if "generate" in selected:
+            async def generate() -> Dict[str, Any]:
+                response = await client.post("/api/v1/changelogs/generate", json={
+                    "owner": BENCH_OWNER,
+                    "repo": BENCH_REPO,
+                    "commits": commits,
+                    "selected_commit_shas": [c["sha"] for c in commits]
+                })
+                response.raise_for_status()
+                return {"input_commits": len(commits)}
+
+            results["generate"] = await measure(generate, args.iterations)
+            print(f"generate: {results['generate']['median_ms']} ms median", file=sys.stderr)
+
+        if "list_changelogs" in selected:
+            seed_start = time.perf_counter()
+            seed_changelogs(args.rows)
+            seed_seconds = time.perf_counter() - seed_start
+
+            async def list_changelogs() -> Dict[str, Any]:
+                response = await client.get("/api/v1/changelogs/", params={"published_only": "true"})
+                response.raise_for_status()
+                return {"rows": args.rows, "response_bytes": len(response.content)}
+
+            results["list_changelogs"] = await measure(list_changelogs, args.iterations)
+            results["list_changelogs"]["seed_seconds"] = round(seed_seconds, 3)
+            print(f"list_changelogs: {results['list_changelogs']['median_ms']} ms median", file=sys.stderr)
+
+    return results
+
+
+SCENARIOS = [
+    "fetch_commits_10", "fetch_commits_100", "fetch_commits_500",
+    "fetch_commits_10_warm", "fetch_commits_100_warm", "fetch_commits_500_warm",
+    "prompt_build", "generate", "list_changelogs",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline backend benchmarks")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write results to")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=100_000, help="Changelog rows to seed for list_changelogs")
+    parser.add_argument("--github-latency-ms", type=float, default=20.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=200.0)
+    parser.add_argument("--rate-limit", type=int, default=1_000_000)
+    parser.add_argument("--patch-lines", type=int, default=200)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        github_latency_ms=args.github_latency_ms,
+        openai_latency_ms=args.openai_latency_ms,
+        rate_limit=args.rate_limit,
+        patch_lines=args.patch_lines
+    )
+    server = MockServer(config).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(server.base_url, os.path.join(tmp, "bench.db"))
+        try:
+            results = asyncio.run(run(args))
+        finally:
+            server.stop()
+
+    report = {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "iterations": args.iterations,
+            "rows": args.rows,
+            "github_latency_ms": args.github_latency_ms,
+            "openai_latency_ms": args.openai_latency_ms,
+            "patch_lines": args.patch_lines,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from typing import List, Dict, Any, Optional, Tuple
+from commit_service import commit_service
+from commit_collapse import collapse_commits
+from diff_filter import diff_filter_for
+from llm_backend import llm_client
+from timing import span
+from config import settings
+
+SYSTEM_PROMPT = "You are a helpful assistant that creates clear, user-friendly changelogs from commit data."
+
+PROMPT_TEMPLATE = """
+Given the following commit messages and code changes from a GitHub repository, create a user-friendly changelog that summarizes the changes in a clear, organized way.
+
+Focus on:
+- User-visible changes and new features
+- Bug fixes and improvements
+- Breaking changes (if any)
+- Technical improvements that affect users
+
+Format as a markdown changelog with appropriate sections (Features, Bug Fixes, Improvements, etc.).
+
+{formatted_commits}
+
+Please create a changelog:
+"""
+
+
+def build_prompt(
+    repository: str,
+    commits: List[Dict[str, Any]],
+    ignore_patterns: Optional[List[str]] = None,
+    keep_patterns: Optional[List[str]] = None
+) -> Tuple[str, Optional[Dict[str, int]]]:
+    """
+    Build the changelog prompt for commits of a repository (owner/repo format).
+
+    ignore_patterns and keep_patterns should match those the commits were
+    fetched with, so files the user kept are not treated as noise again.
+    Returns the prompt and the commit collapsing stats (None when collapsing is disabled).
+    """
+    # Collapse merges, revert pairs, bot bumps and near-duplicate commits
+    notes = []
+    collapse_stats = None
+    if settings.COLLAPSE_COMMITS:
+        with span("collapse"):
+            collapsed = collapse_commits(commits)
+        commits, notes, collapse_stats = collapsed.commits, collapsed.notes, collapsed.stats
+
+    # Format commits for AI, leaving out lockfiles and generated files
+    diff_filter = diff_filter_for(repository, ignore_patterns=ignore_patterns, keep_patterns=keep_patterns)
+    with span("prompt"):
+        formatted_commits = commit_service.format_commits_for_ai(commits, diff_filter, notes)
+
+    return PROMPT_TEMPLATE.format(formatted_commits=formatted_commits), collapse_stats
+
+
+async def generate_changelog_content(prompt: str) -> str:
+    """Generate changelog markdown for a prompt with the configured LLM backend"""
+    return await llm_client.chat(SYSTEM_PROMPT, prompt)
@@ -1,16 +1,24 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 import json
 
 from database import get_db, Changelog, init_db
 from commit_service import commit_service
+from diff_filter import diff_filter_for
 from config import settings
 from auth_middleware import get_authenticated_user_token
+from changelog_generator import build_prompt, generate_changelog_content
+from llm_backend import llm_client
+from timing import TimedRoute
+from static_publisher import publish_changelog
+from revisions import record_revision, delete_revisions
+from repository_stats import RepositoryStatsTracker
 
-router = APIRouter(prefix="/api/v1/changelogs", tags=["Changelogs"])
+router = APIRouter(prefix="/api/v1/changelogs", tags=["Changelogs"], route_class=TimedRoute)
 
 # Initialize database
 init_db()
@@ -22,13 +30,18 @@ class CommitsFetchRequest(BaseModel):
     repo: str
     since_date: Optional[str] = None
     until_date: Optional[str] = None
-    max_commits: Optional[int] = 50
+    max_commits: Optional[int] = Field(50, ge=1, le=settings.MAX_FETCH_COMMITS)
+    ignore_patterns: Optional[List[str]] = None
+    keep_patterns: Optional[List[str]] = None
 
 class ChangelogGenerateRequest(BaseModel):
     owner: str
     repo: str
     commits: List[Dict[str, Any]]
     selected_commit_shas: List[str]
+    # Same patterns as sent to fetch-commits
+    ignore_patterns: Optional[List[str]] = None
+    keep_patterns: Optional[List[str]] = None
 
 class ChangelogSaveRequest(BaseModel):
     title: str
@@ -43,27 +56,37 @@ class ChangelogUpdateRequest(BaseModel):
     content: Optional[str] = None
     published: Optional[bool] = None
 
-@router.post("/fetch-commits")
+# Commit and patch payloads are large, so these routes serialise with orjson
+# directly instead of going through jsonable_encoder
+@router.post("/fetch-commits", response_class=ORJSONResponse)
 async def fetch_commits(commits_request: CommitsFetchRequest, request: Request):
     """Fetch commits with detailed information for selection"""
     try:
         # Get user's GitHub token from session
         user_token = get_authenticated_user_token(request)
         
+        diff_filter = diff_filter_for(
+            f"{commits_request.owner}/{commits_request.repo}",
+            ignore_patterns=commits_request.ignore_patterns,
+            keep_patterns=commits_request.keep_patterns
+        )
+        
         commits = await commit_service.fetch_commits_with_details(
             owner=commits_request.owner,
             repo=commits_request.repo,
             since_date=commits_request.since_date,
             until_date=commits_request.until_date,
             max_commits=commits_request.max_commits or 50,
-            user_token=user_token
+            user_token=user_token,
+            diff_filter=diff_filter
         )
         
-        return {
+        return ORJSONResponse({
             "status": "success",
-            "commits": commits,
-            "count": len(commits)
-        }
+            "commits": [commit.to_dict() for commit in commits],
+            "count": len(commits),
+            "filter_stats": diff_filter.stats.to_dict()
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch commits: {str(e)}")
 
@@ -71,8 +94,8 @@ async def fetch_commits(commits_request: CommitsFetchRequest, request: Request):
 async def generate_changelog(request: ChangelogGenerateRequest):
     """Generate changelog from selected commits using AI"""
     try:
-        if not settings.OPENAI_API_KEY:
-            raise HTTPException(status_code=500, detail="OpenAI API not configured")
+        if not llm_client.configured:
+            raise HTTPException(status_code=500, detail="LLM backend not configured")
         
         # Filter commits by selected SHAs
         selected_commits = [
@@ -83,60 +106,31 @@ async def generate_changelog(request: ChangelogGenerateRequest):
         if not selected_commits:
             raise HTTPException(status_code=400, detail="No commits selected")
         
-        # Format commits for AI
-        formatted_commits = commit_service.format_commits_for_ai(selected_commits)
-        
-        # Create AI prompt
-        prompt = f"""
-Given the following commit messages and code changes from a GitHub repository, create a user-friendly changelog that summarizes the changes in a clear, organized way.
-
-Focus on:
-- User-visible changes and new features
-- Bug fixes and improvements
-- Breaking changes (if any)
-- Technical improvements that affect users
-
-Format as a markdown changelog with appropriate sections (Features, Bug Fixes, Improvements, etc.).
-
-{formatted_commits}
-
-Please create a changelog:
-"""
+        prompt, collapse_stats = build_prompt(
+            f"{request.owner}/{request.repo}",
+            selected_commits,
+            ignore_patterns=request.ignore_patterns,
+            keep_patterns=request.keep_patterns
+        )
         
-        # Call OpenAI API
+        # Call the LLM backend
         try:
-            import openai
-            
-            # Create OpenAI client with minimal configuration
-            client = openai.OpenAI(
-                api_key=settings.OPENAI_API_KEY
-            )
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that creates clear, user-friendly changelogs from commit data."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.7
-            )
-            
-            changelog_content = response.choices[0].message.content
+            changelog_content = await generate_changelog_content(prompt)
             
             return {
                 "status": "success",
-                "changelog": changelog_content
+                "changelog": changelog_content,
+                "collapse_stats": collapse_stats
             }
             
-        except Exception as openai_error:
-            raise HTTPException(status_code=500, detail=f"OpenAI API error: {str(openai_error)}")
+        except Exception as llm_error:
+            raise HTTPException(status_code=500, detail=f"LLM backend error: {str(llm_error)}")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate changelog: {str(e)}")
 
 @router.post("/save")
-async def save_changelog(request: ChangelogSaveRequest, db: Session = Depends(get_db)):
+async def save_changelog(request: ChangelogSaveRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Save changelog to database"""
     try:
         changelog = Changelog(
@@ -150,9 +144,15 @@ async def save_changelog(request: ChangelogSaveRequest, db: Session = Depends(ge
         )
         
         db.add(changelog)
+        stats = RepositoryStatsTracker()
+        stats.add(changelog)
+        stats.apply(db)
         db.commit()
         db.refresh(changelog)
         
+        if changelog.published:
+            background_tasks.add_task(publish_changelog, changelog.id, changelog.repository)
+        
         return {
             "status": "success",
             "changelog_id": changelog.id,
@@ -217,7 +217,7 @@ async def list_changelogs(published_only: bool = False, db: Session = Depends(ge
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list changelogs: {str(e)}")
 
-@router.get("/{changelog_id}")
+@router.get("/{changelog_id}", response_class=ORJSONResponse)
 async def get_changelog(changelog_id: int, db: Session = Depends(get_db)):
     """Get a specific changelog"""
     try:
@@ -225,7 +225,7 @@ async def get_changelog(changelog_id: int, db: Session = Depends(get_db)):
         if not changelog:
             raise HTTPException(status_code=404, detail="Changelog not found")
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "changelog": {
                 "id": changelog.id,
@@ -237,7 +237,7 @@ async def get_changelog(changelog_id: int, db: Session = Depends(get_db)):
                 "published": changelog.published,
                 "raw_commits": changelog.raw_commits
             }
-        }
+        })
         
     except HTTPException:
         raise
@@ -245,13 +245,22 @@ async def get_changelog(changelog_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get changelog: {str(e)}")
 
 @router.put("/{changelog_id}")
-async def update_changelog(changelog_id: int, request: ChangelogUpdateRequest, db: Session = Depends(get_db)):
+async def update_changelog(
+    changelog_id: int,
+    request: ChangelogUpdateRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Update a changelog"""
     try:
         changelog = db.query(Changelog).filter(Changelog.id == changelog_id).first()
         if not changelog:
             raise HTTPException(status_code=404, detail="Changelog not found")
         
+        was_published = changelog.published
+        previous_title, previous_content = changelog.title, changelog.content
+        stats = RepositoryStatsTracker()
+        stats.remove(changelog)
         if request.title is not None:
             changelog.title = request.title
         if request.content is not None:
@@ -259,9 +268,20 @@ async def update_changelog(changelog_id: int, request: ChangelogUpdateRequest, d
         if request.published is not None:
             changelog.published = request.published
         
+        # Keep the edit history as deltas; the row itself only holds the current text
+        if changelog.title != previous_title or changelog.content != previous_content:
+            record_revision(db, changelog, previous_title, previous_content, author="system")
+        
+        if changelog.published != was_published:
+            stats.add(changelog)
+            stats.apply(db)
+        
         db.commit()
         db.refresh(changelog)
         
+        if was_published or changelog.published:
+            background_tasks.add_task(publish_changelog, changelog.id, changelog.repository)
+        
         return {
             "status": "success",
             "message": "Changelog updated successfully"
@@ -274,16 +294,24 @@ async def update_changelog(changelog_id: int, request: ChangelogUpdateRequest, d
         raise HTTPException(status_code=500, detail=f"Failed to update changelog: {str(e)}")
 
 @router.delete("/{changelog_id}")
-async def delete_changelog(changelog_id: int, db: Session = Depends(get_db)):
+async def delete_changelog(changelog_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Delete a changelog"""
     try:
         changelog = db.query(Changelog).filter(Changelog.id == changelog_id).first()
         if not changelog:
             raise HTTPException(status_code=404, detail="Changelog not found")
         
+        was_published, repository = changelog.published, changelog.repository
+        delete_revisions(db, changelog_id)
+        stats = RepositoryStatsTracker()
+        stats.remove(changelog)
         db.delete(changelog)
+        stats.apply(db)
         db.commit()
         
+        if was_published:
+            background_tasks.add_task(publish_changelog, changelog_id, repository)
+        
         return {
             "status": "success",
             "message": "Changelog deleted successfully"
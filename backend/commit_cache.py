@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Iterable
+from sqlalchemy.exc import IntegrityError
+from database import SessionLocal, CommitCacheEntry
+from commit_models import CommitRecord
+from metrics import record_cache
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+_last_prune = None
+_prune_lock = threading.Lock()
+
+
+def get_cached_commits(repository: str, shas: List[str]) -> Dict[str, CommitRecord]:
+    """Look up cached commit records for a repository, keyed by SHA"""
+    found: Dict[str, CommitRecord] = {}
+    if not shas:
+        return found
+
+    db = SessionLocal()
+    try:
+        for i in range(0, len(shas), _LOOKUP_CHUNK):
+            rows = db.query(CommitCacheEntry.sha, CommitCacheEntry.data).filter(
+                CommitCacheEntry.repository == repository,
+                CommitCacheEntry.sha.in_(shas[i:i + _LOOKUP_CHUNK])
+            ).all()
+            for sha, data in rows:
+                found[sha] = CommitRecord.from_dict(data)
+    finally:
+        db.close()
+
+    for sha in shas:
+        record_cache("commit_details", sha in found)
+    return found
+
+
+def cached_shas(repository: str, shas: Iterable[str]) -> set:
+    """Return the subset of SHAs already cached for a repository"""
+    shas = list(shas)
+    db = SessionLocal()
+    try:
+        present = set()
+        for i in range(0, len(shas), _LOOKUP_CHUNK):
+            present.update(sha for (sha,) in db.query(CommitCacheEntry.sha).filter(
+                CommitCacheEntry.repository == repository,
+                CommitCacheEntry.sha.in_(shas[i:i + _LOOKUP_CHUNK])
+            ))
+        return present
+    finally:
+        db.close()
+
+
+def store_commits(repository: str, commits: List[CommitRecord]):
+    """
+    Store commit records for a repository.
+
+    Commits are immutable, so entries that already exist are left as they are.
+    """
+    if not commits:
+        return
+
+    db = SessionLocal()
+    try:
+        existing = cached_shas(repository, (commit.sha for commit in commits))
+        for commit in commits:
+            if commit.sha not in existing:
+                existing.add(commit.sha)
+                db.add(CommitCacheEntry(repository=repository, sha=commit.sha, data=commit.to_dict()))
+        db.commit()
+    except IntegrityError:
+        # Another writer cached the same commit concurrently
+        db.rollback()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to store commits in cache: {str(e)}")
+    finally:
+        db.close()
+
+    _maybe_prune()
+
+
+def _maybe_prune():
+    """Prune at most once per COMMIT_CACHE_PRUNE_INTERVAL, from whichever writer gets there first"""
+    global _last_prune
+    if _last_prune is not None and time.monotonic() - _last_prune < settings.COMMIT_CACHE_PRUNE_INTERVAL:
+        return
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        _last_prune = time.monotonic()
+        prune_commit_cache()
+    finally:
+        _prune_lock.release()
+
+
+def prune_commit_cache() -> int:
+    """
+    Evict entries fetched more than COMMIT_CACHE_TTL_DAYS ago, then the oldest
+    entries beyond COMMIT_CACHE_MAX_ENTRIES. Returns the number of entries removed.
+    """
+    db = SessionLocal()
+    try:
+        removed = 0
+        if settings.COMMIT_CACHE_TTL_DAYS > 0:
+            cutoff = datetime.utcnow() - timedelta(days=settings.COMMIT_CACHE_TTL_DAYS)
+            removed += db.query(CommitCacheEntry).filter(
+                CommitCacheEntry.fetched_at < cutoff
+            ).delete(synchronize_session=False)
+
+        if settings.COMMIT_CACHE_MAX_ENTRIES > 0:
+            # Ids grow with insertion, so everything at or below the newest
+            # entry past the limit is older than the entries being kept
+            boundary = db.query(CommitCacheEntry.id).order_by(
+                CommitCacheEntry.id.desc()
+            ).offset(settings.COMMIT_CACHE_MAX_ENTRIES).limit(1).scalar()
+            if boundary is not None:
+                removed += db.query(CommitCacheEntry).filter(
+                    CommitCacheEntry.id <= boundary
+                ).delete(synchronize_session=False)
+
+        db.commit()
+        if removed:
+            logger.info(f"Pruned {removed} commit cache entries")
+        return removed
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to prune commit cache: {str(e)}")
+        return 0
+    finally:
+        db.close()
+
+
+def clear_commit_cache():
+    """Remove every cached commit"""
+    db = SessionLocal()
+    try:
+        db.query(CommitCacheEntry).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,200 @@
+import re
+import hashlib
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Set, Tuple
+from config import settings
+
+MERGE_RE = re.compile(r"^Merge (?:pull request|branch|remote-tracking branch)\b")
+PR_MERGE_RE = re.compile(r"^Merge pull request (#\d+)")
+REVERT_RE = re.compile(r'^Revert "(.+)"\s*$')
+REVERTS_SHA_RE = re.compile(r"This reverts commit ([0-9a-f]{7,40})")
+BUMP_RE = re.compile(r"^(?:(?:build|chore|deps)(?:\(deps(?:-dev)?\))?:\s*)?[Bb]ump (\S+) from (\S+) to (\S+)")
+LOW_SIGNAL_RE = re.compile(
+    r"^(?:wip|fix(?:ed)? typos?|typo|fixup!.*|squash!.*|minor( fix(es)?)?|cleanup|oops|fix|tweak|lint|format(ting)?)\.?$",
+    re.IGNORECASE
+)
+TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+MINHASH_SLOTS = 16
+LSH_BANDS = 4
+_ROWS_PER_BAND = MINHASH_SLOTS // LSH_BANDS
+
+
+def minhash(features: Set[str]) -> Tuple[int, ...]:
+    """MinHash signature of a feature set, one 32-bit hash per slot"""
+    if not features:
+        return ()
+
+    hashes = [
+        hashlib.blake2b(feature.encode(), digest_size=4 * MINHASH_SLOTS).digest()
+        for feature in features
+    ]
+    return tuple(
+        min(int.from_bytes(h[slot * 4:slot * 4 + 4], "big") for h in hashes)
+        for slot in range(MINHASH_SLOTS)
+    )
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / MINHASH_SLOTS
+
+
+def _bands(signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [
+        (band, signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND])
+        for band in range(LSH_BANDS)
+    ] if signature else []
+
+
+def _subject(commit: Dict[str, Any]) -> str:
+    return commit["message"].split("\n", 1)[0].strip()
+
+
+def _filenames(commit: Dict[str, Any]) -> Set[str]:
+    return {file["filename"] for file in commit.get("files") or []}
+
+
+def _is_bot(commit: Dict[str, Any]) -> bool:
+    return ((commit.get("author") or {}).get("name") or "").endswith("[bot]")
+
+
+def _oldest_first(commits: List[Dict[str, Any]]) -> List[int]:
+    """Indexes of commits in chronological order"""
+    dates = [(commit.get("author") or {}).get("date") or "" for commit in commits]
+    if all(dates):
+        return sorted(range(len(commits)), key=lambda index: dates[index])
+    # Without dates assume GitHub's order, newest first
+    return list(reversed(range(len(commits))))
+
+
+@dataclass
+class _Cluster:
+    commit: Dict[str, Any]
+    signature: Tuple[int, ...]
+    related: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CollapseResult:
+    """Commits reduced for prompt building, plus one-line summaries of what was folded away"""
+    commits: List[Dict[str, Any]]
+    notes: List[str]
+    stats: Dict[str, int]
+
+
+def collapse_commits(commits: List[Dict[str, Any]], min_similarity: Optional[float] = None) -> CollapseResult:
+    """
+    Collapse merge commits, revert pairs, bot dependency bumps and near-duplicate
+    commits so each logical change reaches the prompt once.
+
+    Near-duplicates are found with MinHash signatures over message words and
+    touched files, bucketed by LSH bands so each commit is only compared with
+    likely matches. Low-signal messages such as "wip" or "fix typo" are folded
+    into the most recent earlier commit touching the same files, so commits are
+    walked oldest-first; the result keeps the order of the input.
+    """
+    threshold = settings.COLLAPSE_SIMILARITY if min_similarity is None else min_similarity
+    stats = {"input": len(commits), "merges": 0, "reverts_cancelled": 0, "bot_bumps": 0, "near_duplicates": 0}
+    notes: List[str] = []
+
+    # Cancel revert pairs whose original commit is part of the selection
+    by_sha = {commit["sha"]: commit for commit in commits}
+    by_subject = {_subject(commit): commit["sha"] for commit in commits}
+    cancelled = set()
+    for commit in commits:
+        match = REVERT_RE.match(_subject(commit))
+        if not match or commit["sha"] in cancelled:
+            continue
+        sha_match = REVERTS_SHA_RE.search(commit["message"])
+        original = None
+        if sha_match:
+            original = next((sha for sha in by_sha if sha.startswith(sha_match.group(1))), None)
+        if original is None:
+            original = by_subject.get(match.group(1))
+        if original and original not in cancelled and original != commit["sha"]:
+            cancelled.update((commit["sha"], original))
+            stats["reverts_cancelled"] += 1
+    if stats["reverts_cancelled"]:
+        notes.append(f"{stats['reverts_cancelled']} change(s) were reverted within this range and have no net effect")
+
+    merged_prs: List[Tuple[int, str]] = []
+    bumps: List[Tuple[int, str]] = []
+    clusters: List[Tuple[int, _Cluster]] = []
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[_Cluster]] = {}
+    by_file: Dict[str, _Cluster] = {}
+
+    for index in _oldest_first(commits):
+        commit = commits[index]
+        if commit["sha"] in cancelled:
+            continue
+
+        subject = _subject(commit)
+
+        if MERGE_RE.match(subject):
+            stats["merges"] += 1
+            pr = PR_MERGE_RE.match(subject)
+            body = commit["message"].split("\n", 1)[1].strip() if "\n" in commit["message"] else ""
+            if pr:
+                merged_prs.append((index, f"{pr.group(1)} {body.splitlines()[0]}" if body else pr.group(1)))
+            continue
+
+        bump = BUMP_RE.match(subject)
+        if bump or (_is_bot(commit) and "bump" in subject.lower()):
+            stats["bot_bumps"] += 1
+            bumps.append((index, f"{bump.group(1)} {bump.group(2)} -> {bump.group(3)}" if bump else subject))
+            continue
+
+        filenames = _filenames(commit)
+        signature = minhash({f"file:{name}" for name in filenames} | set(TOKEN_RE.findall(subject.lower())))
+
+        target = None
+        if LOW_SIGNAL_RE.match(subject):
+            owners = [by_file[name] for name in filenames if name in by_file]
+            if owners and len(owners) == len(filenames) and all(o is owners[0] for o in owners):
+                target = owners[0]
+        else:
+            candidates = {id(c): c for band in _bands(signature) for c in buckets.get(band, [])}
+            best = max(candidates.values(), key=lambda c: similarity(c.signature, signature), default=None)
+            if best is not None and similarity(best.signature, signature) >= threshold:
+                target = best
+
+        if target is None:
+            target = _Cluster(commit=dict(commit), signature=signature)
+            clusters.append((index, target))
+            for band in _bands(signature):
+                buckets.setdefault(band, []).append(target)
+            for name in filenames:
+                by_file[name] = target
+            continue
+
+        # Fold the commit into the cluster, keeping only file names it adds
+        stats["near_duplicates"] += 1
+        target.related.append(subject)
+        known = {file["filename"] for file in target.commit.get("files") or []}
+        extra_files = [
+            {**file, "patch": ""}
+            for file in commit.get("files") or []
+            if file["filename"] not in known
+        ]
+        if extra_files:
+            target.commit["files"] = list(target.commit.get("files") or []) + extra_files
+        for name in filenames:
+            by_file[name] = target
+
+    if merged_prs:
+        notes.append("Merged pull requests: " + "; ".join(text for _, text in sorted(merged_prs)))
+    if bumps:
+        notes.append("Dependency updates: " + ", ".join(text for _, text in sorted(bumps)))
+
+    collapsed = []
+    for _, cluster in sorted(clusters, key=lambda item: item[0]):
+        if cluster.related:
+            cluster.commit["related_messages"] = cluster.related
+        collapsed.append(cluster.commit)
+
+    stats["output"] = len(collapsed)
+    return CollapseResult(commits=collapsed, notes=notes, stats=stats)
@@ -0,0 +1,124 @@
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional
+from config import settings
+
+
+def trim_patch(patch: Optional[str], max_chars: Optional[int] = None) -> str:
+    """Trim a patch to the configured character budget, cutting at a line boundary"""
+    if not patch:
+        return ""
+
+    budget = settings.MAX_PATCH_CHARS if max_chars is None else max_chars
+    if len(patch) <= budget:
+        return patch
+
+    cut = patch.rfind("\n", 0, budget)
+    return patch[:cut if cut > 0 else budget]
+
+
+@dataclass
+class FileRecord:
+    """Compact representation of a single file change within a commit"""
+    __slots__ = ("filename", "status", "additions", "deletions", "changes", "patch", "filtered")
+
+    filename: str
+    status: str  # added, modified, removed, renamed
+    additions: int
+    deletions: int
+    changes: int
+    patch: str
+    filtered: bool  # True when the patch was removed by the diff filter
+
+    @classmethod
+    def from_github(cls, file: Dict[str, Any]) -> "FileRecord":
+        """Build a record from a GitHub file payload, trimming the patch immediately"""
+        return cls(
+            filename=file["filename"],
+            status=file["status"],
+            additions=file.get("additions", 0),
+            deletions=file.get("deletions", 0),
+            changes=file.get("changes", 0),
+            patch=trim_patch(file.get("patch")),
+            filtered=False
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileRecord":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class CommitRecord:
+    """Compact representation of a commit with its file changes"""
+    __slots__ = (
+        "sha", "message", "author_name", "author_email", "date",
+        "url", "additions", "deletions", "total", "files"
+    )
+
+    sha: str
+    message: str
+    author_name: str
+    author_email: str
+    date: str
+    url: str
+    additions: int
+    deletions: int
+    total: int
+    files: List[FileRecord]
+
+    @classmethod
+    def from_github(cls, commit: Dict[str, Any]) -> "CommitRecord":
+        """Build a record from a GitHub commit-detail payload"""
+        author = commit["commit"]["author"]
+        stats = commit.get("stats", {})
+        return cls(
+            sha=commit["sha"],
+            message=commit["commit"]["message"],
+            author_name=author["name"],
+            author_email=author["email"],
+            date=author["date"],
+            url=commit["html_url"],
+            additions=stats.get("additions", 0),
+            deletions=stats.get("deletions", 0),
+            total=stats.get("total", 0),
+            files=[FileRecord.from_github(file) for file in commit.get("files", [])]
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CommitRecord":
+        """Rebuild a record from the shape produced by to_dict"""
+        stats = data.get("stats") or {}
+        return cls(
+            sha=data["sha"],
+            message=data["message"],
+            author_name=data["author"]["name"],
+            author_email=data["author"]["email"],
+            date=data["author"]["date"],
+            url=data["url"],
+            additions=stats.get("additions", 0),
+            deletions=stats.get("deletions", 0),
+            total=stats.get("total", 0),
+            files=[FileRecord.from_dict(file) for file in data.get("files", [])]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise to the commit shape returned by the API"""
+        return {
+            "sha": self.sha,
+            "message": self.message,
+            "author": {
+                "name": self.author_name,
+                "email": self.author_email,
+                "date": self.date
+            },
+            "url": self.url,
+            "stats": {
+                "additions": self.additions,
+                "deletions": self.deletions,
+                "total": self.total
+            },
+            "files": [file.to_dict() for file in self.files]
+        }
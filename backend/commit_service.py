@@ -1,6 +1,12 @@
-from github_api import github_api, GitHubAPI, GitHubAPIError
+from github_api import github_api, GitHubAPI, GitHubAPIError, RateLimitBudget
+from commit_models import CommitRecord
+from diff_filter import DiffFilter, diff_filter_for
+from commit_cache import get_cached_commits, store_commits
+from timing import span
+from config import settings
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,54 +21,67 @@ class CommitService:
         since_date: Optional[str] = None,
         until_date: Optional[str] = None,
         max_commits: int = 50,
-        user_token: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+        user_token: Optional[str] = None,
+        diff_filter: Optional[DiffFilter] = None,
+        budget: Optional[RateLimitBudget] = None
+    ) -> List[CommitRecord]:
         """
         Fetch commits with detailed information including diffs
+        
+        Commit details already in the local commit cache (e.g. prefetched by
+        the push webhook warmer) are read from there; newly fetched commits
+        are added to it. As each commit is parsed, the patches of files the
+        repository's own filter rules treat as noise are emptied, so they are
+        neither held in memory nor cached.
+        
+        When a diff filter is given, it is applied once all commits are in:
+        noisy files are summarised or removed and commits touching only noisy
+        files are dropped. Request-level keep patterns can bring back a file
+        the repository rules strip, but not its patch.
+        
+        A rate-limit budget can be shared between concurrent fetches to bound
+        their combined GitHub usage.
         """
         try:
             # Use user token if provided, otherwise fall back to global instance
-            if user_token:
-                github_api_instance = GitHubAPI(user_token=user_token)
+            if user_token or budget:
+                github_api_instance = GitHubAPI(user_token=user_token, budget=budget)
             else:
                 github_api_instance = github_api
             
-            # Get commits with diffs
-            commits_with_diffs = await github_api_instance.get_commits_with_diffs(
-                owner, repo, since_date, until_date, max_commits
+            repository = f"{owner}/{repo}"
+            # Cached records must not depend on request-level patterns
+            cache_filter = diff_filter_for(repository)
+            fetched: List[CommitRecord] = []
+            
+            # Each payload is reduced to a compact record as soon as it is parsed,
+            # so untrimmed and noisy patches never accumulate in memory
+            def process(commit: Dict[str, Any]) -> CommitRecord:
+                with span("parse"):
+                    record = CommitRecord.from_github(commit)
+                    saved = cache_filter.strip_patches(record)
+                if diff_filter:
+                    diff_filter.stats.patch_chars_saved += saved
+                fetched.append(record)
+                return record
+            
+            async def lookup(shas: List[str]) -> Dict[str, CommitRecord]:
+                with span("cache"):
+                    return await asyncio.to_thread(get_cached_commits, repository, shas)
+            
+            records = await github_api_instance.get_commits_with_diffs(
+                owner, repo, since_date, until_date, max_commits,
+                process=process,
+                lookup=lookup
             )
             
-            processed_commits = []
-            for commit in commits_with_diffs:
-                processed_commit = {
-                    "sha": commit["sha"],
-                    "message": commit["commit"]["message"],
-                    "author": {
-                        "name": commit["commit"]["author"]["name"],
-                        "email": commit["commit"]["author"]["email"],
-                        "date": commit["commit"]["author"]["date"]
-                    },
-                    "url": commit["html_url"],
-                    "stats": commit.get("stats", {}),
-                    "files": []
-                }
-                
-                # Process file changes
-                if "files" in commit:
-                    for file in commit["files"]:
-                        file_info = {
-                            "filename": file["filename"],
-                            "status": file["status"],  # added, modified, removed, renamed
-                            "additions": file.get("additions", 0),
-                            "deletions": file.get("deletions", 0),
-                            "changes": file.get("changes", 0),
-                            "patch": file.get("patch", "")[:5000] if file.get("patch") else ""  # Limit patch size
-                        }
-                        processed_commit["files"].append(file_info)
-                
-                processed_commits.append(processed_commit)
+            # Stored before the request filter edits the records in place
+            with span("cache"):
+                await asyncio.to_thread(store_commits, repository, fetched)
             
-            return processed_commits
+            if diff_filter:
+                records = diff_filter.filter_records(records)
+            return records
             
         except GitHubAPIError as e:
             logger.error(f"GitHub API error: {str(e)}")
@@ -71,33 +90,59 @@ class CommitService:
             logger.error(f"Unexpected error in fetch_commits_with_details: {str(e)}")
             raise
 
-    def format_commits_for_ai(self, commits: List[Dict[str, Any]]) -> str:
+    def format_commits_for_ai(
+        self,
+        commits: List[Dict[str, Any]],
+        diff_filter: Optional[DiffFilter] = None,
+        notes: Optional[List[str]] = None
+    ) -> str:
         """
         Format commits data for AI processing
+        
+        Files flagged by the diff filter are summarised on a single line
+        instead of being listed with their diffs. Notes (e.g. collapsed
+        dependency bumps) are appended as one-line entries.
         """
         formatted_text = "COMMITS AND CHANGES:\n\n"
         
+        if diff_filter:
+            commits = [commit for commit in commits if not diff_filter.is_noise_only(commit)]
+        
         for i, commit in enumerate(commits, 1):
             formatted_text += f"COMMIT {i}:\n"
             formatted_text += f"Author: {commit['author']['name']}\n"
             formatted_text += f"Date: {commit['author']['date']}\n"
             formatted_text += f"Message: {commit['message']}\n"
             
+            if commit.get('related_messages'):
+                formatted_text += f"Follow-up commits: {'; '.join(commit['related_messages'])}\n"
+            
             if commit.get('stats', {}).get('total', 0) > 0:
                 stats = commit['stats']
                 formatted_text += f"Stats: +{stats.get('additions', 0)} -{stats.get('deletions', 0)} changes\n"
             
             if commit['files']:
                 formatted_text += "Files changed:\n"
+                noisy_files = []
                 for file in commit['files']:
+                    if file.get('filtered') or (diff_filter and diff_filter.is_noise(file['filename'])):
+                        noisy_files.append(file['filename'])
+                        continue
                     formatted_text += f"  - {file['filename']} ({file['status']})\n"
                     if file['patch'] and len(file['patch']) > 0:
                         # Include a truncated diff for context
-                        patch_lines = file['patch'].split('\n')[:10]  # First 10 lines
+                        patch_lines = file['patch'].split('\n', settings.PROMPT_DIFF_LINES)[:settings.PROMPT_DIFF_LINES]
                         formatted_text += f"    Diff: {chr(10).join(patch_lines)}\n"
+                if noisy_files:
+                    formatted_text += f"  - {len(noisy_files)} lockfile/generated/vendored file(s) omitted: {', '.join(noisy_files[:5])}\n"
             
             formatted_text += "\n" + "-"*50 + "\n\n"
         
+        if notes:
+            formatted_text += "OTHER CHANGES:\n"
+            for note in notes:
+                formatted_text += f"- {note}\n"
+        
         return formatted_text
 
 commit_service = CommitService()
\ No newline at end of file
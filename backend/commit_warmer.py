@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import List, Set, Tuple, Optional
+from github_api import github_api, GitHubAPIError
+from commit_models import CommitRecord
+from diff_filter import diff_filter_for
+from commit_cache import cached_shas, store_commits
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CommitWarmer:
+    """
+    Background prefetcher that fills the commit cache with commit details.
+
+    A fixed pool of workers bounds concurrency against GitHub, and commits
+    that are already queued or cached are skipped.
+    """
+
+    def __init__(self, concurrency: int = 4, queue_size: int = 1000):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[Tuple[str, str]] = set()
+        self._workers: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker pool on the running event loop"""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        """Cancel the workers, dropping anything still queued"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._pending.clear()
+
+    async def enqueue(self, repository: str, shas: List[str]) -> int:
+        """Queue commits of a repository (owner/repo format) for prefetching, returning how many were added"""
+        if self._queue is None:
+            return 0
+
+        candidates = [sha for sha in dict.fromkeys(shas) if (repository, sha) not in self._pending]
+        already_cached = await asyncio.to_thread(cached_shas, repository, candidates)
+
+        added = 0
+        for sha in candidates:
+            # Another delivery may have queued it while the cache was checked
+            if sha in already_cached or (repository, sha) in self._pending:
+                continue
+            try:
+                self._queue.put_nowait((repository, sha))
+            except asyncio.QueueFull:
+                logger.warning(f"Commit warmer queue full, dropping {repository}@{sha}")
+                break
+            self._pending.add((repository, sha))
+            added += 1
+        return added
+
+    async def _worker(self):
+        while True:
+            repository, sha = await self._queue.get()
+            try:
+                owner, repo = repository.split("/", 1)
+                detail = await github_api.get_commit_details(owner, repo, sha)
+                record = CommitRecord.from_github(detail)
+                # Cached commits never hold patches of files the repository filters as noise
+                diff_filter_for(repository).strip_patches(record)
+                await asyncio.to_thread(store_commits, repository, [record])
+            except GitHubAPIError as e:
+                logger.warning(f"Failed to prefetch {repository}@{sha}: {str(e)}")
+            except Exception as e:
+                logger.error(f"Unexpected error prefetching {repository}@{sha}: {str(e)}")
+            finally:
+                self._pending.discard((repository, sha))
+                self._queue.task_done()
+
+
+commit_warmer = CommitWarmer(
+    concurrency=settings.WARMER_CONCURRENCY,
+    queue_size=settings.WARMER_QUEUE_SIZE
+)
@@ -0,0 +1,175 @@
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Content types that are already compressed and gain nothing from another pass
+INCOMPRESSIBLE_TYPES = (b"image/", b"video/", b"audio/", b"application/gzip", b"application/zip", b"font/woff")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+
+    # Highest q wins; on a tie br is preferred for its better ratio
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Incremental gzip or brotli compressor"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """Compress a chunk; flush makes everything so far decodable by the client"""
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + self._brotli.flush() if flush else out
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli or gzip, negotiated
+    through Accept-Encoding.
+
+    Single-message bodies below minimum_size and partial (206/Content-Range)
+    responses are sent as-is, and strong ETags are weakened on compressed
+    responses. Streamed bodies are compressed chunk by chunk and flushed
+    once stream_flush_size uncompressed bytes have built up, since flushing
+    every small chunk costs most of the compression ratio. Progress streams
+    (text/event-stream, or any response sent with "X-Accel-Buffering: no")
+    are flushed after each chunk so they still reach the client immediately.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        stream_flush_size: int = 64 * 1024
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stream_flush_size = stream_flush_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+        flush_each = False
+        unflushed = 0
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough, flush_each, unflushed
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                response_headers = message.get("headers", [])
+                content_type = next((v for k, v in response_headers if k.lower() == b"content-type"), b"")
+                already_encoded = any(k.lower() == b"content-encoding" for k, _ in response_headers)
+                # Content-Range describes identity bytes, so partial responses must stay uncompressed
+                partial = message["status"] == 206 or any(k.lower() == b"content-range" for k, _ in response_headers)
+                if already_encoded or partial or content_type.startswith(INCOMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                flush_each = content_type.startswith(b"text/event-stream") or any(
+                    k.lower() == b"x-accel-buffering" and v.lower() == b"no" for k, v in response_headers
+                )
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                response_headers = []
+                for k, v in start_message.get("headers", []):
+                    if k.lower() == b"content-length":
+                        continue
+                    if k.lower() == b"etag" and not v.startswith(b"W/"):
+                        # The encoded body differs byte-wise, so the validator becomes weak
+                        v = b"W/" + v
+                    response_headers.append((k, v))
+                response_headers.append((b"content-encoding", encoding.encode()))
+                response_headers.append((b"vary", b"Accept-Encoding"))
+
+                if not more_body:
+                    compressed = compressor.compress(body) + compressor.finish()
+                    response_headers.append((b"content-length", str(len(compressed)).encode()))
+                    await send({**start_message, "headers": response_headers})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                await send({**start_message, "headers": response_headers})
+
+            if more_body:
+                unflushed += len(body)
+                flush = flush_each or unflushed >= self.stream_flush_size
+                if flush:
+                    unflushed = 0
+                data = compressor.compress(body, flush=flush)
+                if data:
+                    await send({"type": "http.response.body", "body": data, "more_body": True})
+            else:
+                await send({
+                    "type": "http.response.body",
+                    "body": compressor.compress(body) + compressor.finish()
+                })
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,4 +1,5 @@
 import os
+import json
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -9,7 +10,8 @@ class Settings:
     
     # GitHub API Configuration
     GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN")
-    GITHUB_API_BASE_URL: str = "https://api.github.com"
+    GITHUB_API_BASE_URL: str = os.getenv("GITHUB_API_BASE_URL", "https://api.github.com")
+    GITHUB_WEBHOOK_SECRET: Optional[str] = os.getenv("GITHUB_WEBHOOK_SECRET")
     
     # GitHub OAuth Configuration
     GITHUB_CLIENT_ID: Optional[str] = os.getenv("GITHUB_CLIENT_ID")
@@ -18,7 +20,74 @@ class Settings:
     
     # OpenAI API Configuration
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
-    OPENAI_API_BASE_URL: str = "https://api.openai.com/v1"
+    OPENAI_API_BASE_URL: str = os.getenv("OPENAI_API_BASE_URL", "https://api.openai.com/v1")
+    
+    # LLM Backend Configuration
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "openai")  # openai or local (OpenAI-compatible, no key needed)
+    LLM_BASE_URL: Optional[str] = os.getenv("LLM_BASE_URL")  # defaults to OPENAI_API_BASE_URL or the local mock
+    LLM_API_KEY: Optional[str] = os.getenv("LLM_API_KEY")  # defaults to OPENAI_API_KEY
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
+    LLM_MAX_TOKENS: int = int(os.getenv("LLM_MAX_TOKENS", "1500"))
+    LLM_TEMPERATURE: float = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "60"))  # seconds per attempt
+    LLM_DEADLINE: float = float(os.getenv("LLM_DEADLINE", "120"))  # seconds per call, retries included
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_RETRY_BACKOFF: float = float(os.getenv("LLM_RETRY_BACKOFF", "0.5"))  # seconds, doubled per retry, jittered
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "0"))  # e.g. 95; 0 disables hedging
+    LLM_HEDGE_MIN_SAMPLES: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    
+    # Commit Processing Configuration
+    MAX_PATCH_CHARS: int = int(os.getenv("MAX_PATCH_CHARS", "5000"))
+    PROMPT_DIFF_LINES: int = int(os.getenv("PROMPT_DIFF_LINES", "10"))
+    MAX_FETCH_COMMITS: int = int(os.getenv("MAX_FETCH_COMMITS", "500"))
+    
+    # Diff Noise Filter Configuration
+    DIFF_FILTER_MODE: str = os.getenv("DIFF_FILTER_MODE", "summarise")  # summarise or drop
+    # JSON mapping of owner/repo to {"ignore": [...], "keep": [...], "mode": ..., "use_defaults": bool}
+    DIFF_FILTER_OVERRIDES: dict = json.loads(os.getenv("DIFF_FILTER_OVERRIDES", "{}"))
+    
+    # Commit Collapsing Configuration
+    COLLAPSE_COMMITS: bool = os.getenv("COLLAPSE_COMMITS", "true").lower() == "true"
+    COLLAPSE_SIMILARITY: float = float(os.getenv("COLLAPSE_SIMILARITY", "0.8"))
+    
+    # Commit Cache Warming Configuration
+    WARMER_CONCURRENCY: int = int(os.getenv("WARMER_CONCURRENCY", "4"))
+    WARMER_QUEUE_SIZE: int = int(os.getenv("WARMER_QUEUE_SIZE", "1000"))
+    COMMIT_CACHE_TTL_DAYS: int = int(os.getenv("COMMIT_CACHE_TTL_DAYS", "30"))  # 0 keeps entries forever
+    COMMIT_CACHE_MAX_ENTRIES: int = int(os.getenv("COMMIT_CACHE_MAX_ENTRIES", "50000"))  # 0 for no limit
+    COMMIT_CACHE_PRUNE_INTERVAL: int = int(os.getenv("COMMIT_CACHE_PRUNE_INTERVAL", "3600"))  # seconds
+    
+    # Static Publishing Configuration
+    STATIC_PUBLISH_DIR: str = os.getenv("STATIC_PUBLISH_DIR", "./public")
+    FEED_MAX_ITEMS: int = int(os.getenv("FEED_MAX_ITEMS", "50"))
+    
+    # Batch Generation Configuration
+    BATCH_GITHUB_BUDGET: int = int(os.getenv("BATCH_GITHUB_BUDGET", "2000"))  # max GitHub calls per batch
+    BATCH_GITHUB_CONCURRENCY: int = int(os.getenv("BATCH_GITHUB_CONCURRENCY", "8"))
+    BATCH_REPO_CONCURRENCY: int = int(os.getenv("BATCH_REPO_CONCURRENCY", "4"))
+    BATCH_LLM_CONCURRENCY: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "3"))
+    
+    # Archive Export/Import Configuration
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+    ARCHIVE_MAX_LINE_BYTES: int = int(os.getenv("ARCHIVE_MAX_LINE_BYTES", str(16 * 1024 * 1024)))
+    
+    # Revision History Configuration
+    REVISION_SNAPSHOT_INTERVAL: int = int(os.getenv("REVISION_SNAPSHOT_INTERVAL", "10"))  # full copy every N revisions
+    
+    # Response Compression Configuration
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))  # bytes
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))
+    COMPRESSION_STREAM_FLUSH_SIZE: int = int(os.getenv("COMPRESSION_STREAM_FLUSH_SIZE", str(64 * 1024)))  # bytes
+    
+    # Database Configuration
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./changelog.db")
+    
+    # Profiling Configuration
+    PROFILE_HEADER_ENABLED: bool = os.getenv("PROFILE_HEADER_ENABLED", "false").lower() == "true"  # honour X-Profile: 1
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # fraction of requests profiled
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "./profiles")
     
     # Application Configuration
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
@@ -1,17 +1,22 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, JSON, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.sql import func
 from datetime import datetime
+from config import settings
+from metrics import instrument_engine
 
 # Database setup
-DATABASE_URL = "sqlite:///./changelog.db"
+DATABASE_URL = settings.DATABASE_URL
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 class Changelog(Base):
     __tablename__ = "changelogs"
+    # Lets repository stats recompute the latest published changelog without a scan
+    __table_args__ = (Index("ix_changelogs_repository_published_created_at", "repository", "published", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, default=func.now())
@@ -23,9 +28,46 @@ class Changelog(Base):
     published = Column(Boolean, default=False)
     title = Column(String, nullable=True)
 
+class CommitCacheEntry(Base):
+    __tablename__ = "commit_cache"
+    __table_args__ = (UniqueConstraint("repository", "sha", name="uq_commit_cache_repository_sha"),)
+
+    id = Column(Integer, primary_key=True)
+    repository = Column(String, nullable=False)  # owner/repo format
+    sha = Column(String, nullable=False)
+    data = Column(JSON, nullable=False)  # CommitRecord.to_dict() with patches already trimmed
+    fetched_at = Column(DateTime, default=func.now())
+
+class ChangelogRevision(Base):
+    __tablename__ = "changelog_revisions"
+    __table_args__ = (UniqueConstraint("changelog_id", "revision", name="uq_changelog_revisions_changelog_revision"),)
+
+    id = Column(Integer, primary_key=True)
+    changelog_id = Column(Integer, nullable=False, index=True)
+    revision = Column(Integer, nullable=False)  # 1-based, per changelog
+    created_at = Column(DateTime, default=func.now())
+    author = Column(String, nullable=False)
+    title = Column(String, nullable=True)
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    data = Column(Text, nullable=False)  # full content for snapshots, JSON line delta otherwise
+
+class RepositoryStats(Base):
+    __tablename__ = "repository_stats"
+
+    repository = Column(String, primary_key=True)  # owner/repo format
+    changelog_count = Column(Integer, nullable=False, default=0)
+    published_count = Column(Integer, nullable=False, default=0)
+    commits_covered = Column(Integer, nullable=False, default=0)
+    published_commits_covered = Column(Integer, nullable=False, default=0)
+    latest_published_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
 # Create tables
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips indexes of tables that already exist
+    for index in Changelog.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
 
 # Dependency to get DB session
 def get_db():
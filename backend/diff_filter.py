@@ -0,0 +1,172 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Pattern
+from commit_models import CommitRecord
+from config import settings
+
+# Files that add noise to diffs without describing user-facing changes
+DEFAULT_NOISE_PATTERNS: List[str] = [
+    # Lockfiles
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml",
+    "poetry.lock", "Pipfile.lock", "Cargo.lock", "Gemfile.lock",
+    "composer.lock", "go.sum",
+    # Vendored and build output; directories other than node_modules only at
+    # the repository root, since names like build/ or vendor/ are also used for
+    # source packages (add nested ones per repository via DIFF_FILTER_OVERRIDES)
+    "**/node_modules/**", "vendor/**", "third_party/**",
+    "dist/**", "build/**",
+    # Generated and minified files
+    "*.min.js", "*.min.css", "*.map", "*_pb2.py", "*.pb.go", "*.generated.*",
+    # Binaries and assets
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.ico", "*.pdf",
+    "*.zip", "*.gz", "*.tar", "*.jar", "*.exe", "*.dll", "*.so", "*.dylib",
+    "*.woff", "*.woff2", "*.ttf", "*.eot",
+]
+
+
+def compile_glob(pattern: str) -> Pattern[str]:
+    """
+    Compile a glob into a regex matched against the full file path.
+
+    Patterns without a slash match the file name in any directory, `*` stays
+    within one path segment and `**` spans any number of segments.
+    """
+    if "/" not in pattern:
+        pattern = "**/" + pattern
+
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return re.compile(regex + r"\Z")
+
+
+@dataclass
+class FilterStats:
+    """Running totals of what the diff filter removed"""
+    files_filtered: int = 0
+    commits_dropped: int = 0
+    patch_chars_saved: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "files_filtered": self.files_filtered,
+            "commits_dropped": self.commits_dropped,
+            "patch_chars_saved": self.patch_chars_saved
+        }
+
+
+@dataclass
+class DiffFilter:
+    """
+    Removes lockfiles, vendored code, generated files and binaries from commits.
+
+    In "summarise" mode noisy files keep their name and stats but lose their
+    patch; in "drop" mode they are removed entirely. Commits touching only
+    noisy files are dropped in both modes.
+    """
+    ignore: List[str] = field(default_factory=lambda: list(DEFAULT_NOISE_PATTERNS))
+    keep: List[str] = field(default_factory=list)
+    mode: str = "summarise"
+    stats: FilterStats = field(default_factory=FilterStats)
+
+    def __post_init__(self):
+        self._ignore = [compile_glob(p) for p in self.ignore]
+        self._keep = [compile_glob(p) for p in self.keep]
+
+    def is_noise(self, filename: str) -> bool:
+        """Check whether a file path matches the ignore rules"""
+        if any(p.match(filename) for p in self._keep):
+            return False
+        return any(p.match(filename) for p in self._ignore)
+
+    def filter_record(self, commit: CommitRecord) -> Optional[CommitRecord]:
+        """Filter a commit record in place, returning None if nothing relevant is left"""
+        if not commit.files:
+            return commit
+
+        kept = []
+        noisy = 0
+        for file in commit.files:
+            if not self.is_noise(file.filename):
+                kept.append(file)
+                continue
+
+            noisy += 1
+            self.stats.patch_chars_saved += len(file.patch)
+            if self.mode != "drop":
+                file.patch = ""
+                file.filtered = True
+                kept.append(file)
+
+        self.stats.files_filtered += noisy
+        if noisy == len(commit.files):
+            self.stats.commits_dropped += 1
+            return None
+
+        commit.files = kept
+        return commit
+
+    def strip_patches(self, commit: CommitRecord) -> int:
+        """Empty the patches of noisy files in place, keeping them listed; returns the characters removed"""
+        saved = 0
+        for file in commit.files:
+            if not file.filtered and self.is_noise(file.filename):
+                saved += len(file.patch)
+                file.patch = ""
+                file.filtered = True
+        return saved
+
+    def filter_records(self, commits: List[CommitRecord]) -> List[CommitRecord]:
+        """Filter a list of commit records"""
+        filtered = (self.filter_record(commit) for commit in commits)
+        return [commit for commit in filtered if commit is not None]
+
+    def is_noise_only(self, commit: Dict[str, Any]) -> bool:
+        """Check whether an API-shaped commit dict touches only noisy files"""
+        files = commit.get("files") or []
+        return bool(files) and all(
+            file.get("filtered") or self.is_noise(file["filename"]) for file in files
+        )
+
+
+def diff_filter_for(
+    repository: str,
+    ignore_patterns: Optional[List[str]] = None,
+    keep_patterns: Optional[List[str]] = None
+) -> DiffFilter:
+    """
+    Build the diff filter for a repository (owner/repo format).
+
+    Per-repository overrides come from DIFF_FILTER_OVERRIDES and may set
+    "ignore", "keep", "mode" and "use_defaults"; request-level patterns are
+    appended on top.
+    """
+    override = settings.DIFF_FILTER_OVERRIDES.get(repository, {})
+
+    ignore = list(DEFAULT_NOISE_PATTERNS) if override.get("use_defaults", True) else []
+    ignore += override.get("ignore", [])
+    ignore += ignore_patterns or []
+
+    keep = list(override.get("keep", []))
+    keep += keep_patterns or []
+
+    return DiffFilter(
+        ignore=ignore,
+        keep=keep,
+        mode=override.get("mode", settings.DIFF_FILTER_MODE)
+    )
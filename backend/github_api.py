@@ -1,18 +1,58 @@
 import httpx
-from typing import List, Dict, Any, Optional
+import time
+import asyncio
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from datetime import datetime
 from config import settings
+from metrics import record_github_response
+from timing import span
 
 class GitHubAPIError(Exception):
     """Custom exception for GitHub API errors"""
     pass
 
+class BudgetExhaustedError(GitHubAPIError):
+    """Raised when a shared RateLimitBudget has no requests left"""
+    pass
+
+class RateLimitBudget:
+    """
+    GitHub request budget shared by several concurrent operations.
+    
+    Caps the number of requests in flight and in total, and shrinks the
+    total whenever GitHub reports fewer remaining calls (minus a reserve).
+    """
+    
+    def __init__(self, max_requests: int, concurrency: int = 8, reserve: int = 100):
+        self.remaining = max_requests
+        self.reserve = reserve
+        self.used = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+    
+    async def __aenter__(self):
+        if self.remaining <= 0:
+            raise BudgetExhaustedError("GitHub rate-limit budget exhausted")
+        self.remaining -= 1
+        self.used += 1
+        await self._semaphore.acquire()
+        return self
+    
+    async def __aexit__(self, *exc):
+        self._semaphore.release()
+    
+    def update(self, headers):
+        """Apply the X-RateLimit-Remaining header of a response"""
+        reported = headers.get("X-RateLimit-Remaining")
+        if reported is not None:
+            self.remaining = min(self.remaining, int(reported) - self.reserve)
+
 class GitHubAPI:
     """GitHub API client for fetching repository data"""
     
-    def __init__(self, user_token: Optional[str] = None):
+    def __init__(self, user_token: Optional[str] = None, budget: Optional[RateLimitBudget] = None):
         self.base_url = settings.GITHUB_API_BASE_URL
         self.user_token = user_token
+        self.budget = budget
         self._headers = None
     
     @property
@@ -34,11 +74,33 @@ class GitHubAPI:
             }
         return self._headers
     
+    async def _get(self, client: httpx.AsyncClient, endpoint: str, url: str, **kwargs) -> httpx.Response:
+        """Issue a GET request within the rate-limit budget (if any), recording metrics under the endpoint template"""
+        if self.budget:
+            async with self.budget:
+                response = await self._timed_get(client, endpoint, url, **kwargs)
+            self.budget.update(response.headers)
+            return response
+        return await self._timed_get(client, endpoint, url, **kwargs)
+    
+    async def _timed_get(self, client: httpx.AsyncClient, endpoint: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            with span("github"):
+                response = await client.get(url, **kwargs)
+        except httpx.HTTPError:
+            record_github_response(endpoint, 0, time.perf_counter() - start)
+            raise
+        record_github_response(endpoint, response.status_code, time.perf_counter() - start, response.headers)
+        return response
+    
     async def test_connection(self) -> Dict[str, Any]:
         """Test GitHub API connection and token validity"""
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.get(
+                response = await self._get(
+                    client,
+                    "/user",
                     f"{self.base_url}/user",
                     headers=self.headers
                 )
@@ -72,7 +134,9 @@ class GitHubAPI:
                     "per_page": 100
                 }
                 
-                response = await client.get(
+                response = await self._get(
+                    client,
+                    "/user/repos",
                     f"{self.base_url}/user/repos",
                     headers=self.headers,
                     params=params
@@ -102,7 +166,9 @@ class GitHubAPI:
         """Get basic repository information"""
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.get(
+                response = await self._get(
+                    client,
+                    "/repos/{owner}/{repo}",
                     f"{self.base_url}/repos/{owner}/{repo}",
                     headers=self.headers
                 )
@@ -120,7 +186,7 @@ class GitHubAPI:
         repo: str, 
         since: Optional[str] = None, 
         until: Optional[str] = None,
-        per_page: int = 30
+        max_commits: int = 30
     ) -> List[Dict[str, Any]]:
         """
         Get commits from a repository within a date range
@@ -130,26 +196,40 @@ class GitHubAPI:
             repo: Repository name
             since: ISO 8601 date string (optional)
             until: ISO 8601 date string (optional)
-            per_page: Number of commits per page (max 100)
+            max_commits: Number of commits to return, fetched in pages of up to 100
+                and capped at MAX_FETCH_COMMITS
         """
+        max_commits = max(1, min(max_commits, settings.MAX_FETCH_COMMITS))
+        commits: List[Dict[str, Any]] = []
         async with httpx.AsyncClient() as client:
-            params = {"per_page": min(per_page, 100)}
+            params = {"per_page": min(max_commits, 100)}
             
             if since:
                 params["since"] = since
             if until:
                 params["until"] = until
             
-            try:
-                response = await client.get(
-                    f"{self.base_url}/repos/{owner}/{repo}/commits",
-                    headers=self.headers,
-                    params=params
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise GitHubAPIError(f"Error fetching commits: {e.response.status_code}")
+            page = 1
+            while len(commits) < max_commits:
+                try:
+                    response = await self._get(
+                        client,
+                        "/repos/{owner}/{repo}/commits",
+                        f"{self.base_url}/repos/{owner}/{repo}/commits",
+                        headers=self.headers,
+                        params={**params, "page": page}
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    raise GitHubAPIError(f"Error fetching commits: {e.response.status_code}")
+                
+                batch = response.json()
+                commits.extend(batch)
+                if len(batch) < params["per_page"]:
+                    break
+                page += 1
+        
+        return commits[:max_commits]
     
     async def get_commit_details(self, owner: str, repo: str, sha: str) -> Dict[str, Any]:
         """
@@ -162,7 +242,9 @@ class GitHubAPI:
         """
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.get(
+                response = await self._get(
+                    client,
+                    "/repos/{owner}/{repo}/commits/{sha}",
                     f"{self.base_url}/repos/{owner}/{repo}/commits/{sha}",
                     headers=self.headers
                 )
@@ -177,8 +259,10 @@ class GitHubAPI:
         repo: str, 
         since: Optional[str] = None, 
         until: Optional[str] = None,
-        max_commits: int = 10
-    ) -> List[Dict[str, Any]]:
+        max_commits: int = 10,
+        process: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        lookup: Optional[Callable[[List[str]], Awaitable[Dict[str, Any]]]] = None
+    ) -> List[Any]:
         """
         Get commits with their detailed diffs for changelog generation
         
@@ -188,16 +272,29 @@ class GitHubAPI:
             since: ISO 8601 date string (optional)
             until: ISO 8601 date string (optional)
             max_commits: Maximum number of commits to fetch with diffs
+            process: Optional callable applied to each commit payload as it arrives;
+                only its result is kept, so the raw JSON can be released immediately
+            lookup: Optional coroutine function returning already-known results keyed
+                by SHA; those commits are not fetched from GitHub
         """
         # First get the list of commits
         commits = await self.get_commits(owner, repo, since, until, max_commits)
         
+        commits = commits[:max_commits]  # Limit to prevent API abuse
+        known = await lookup([commit["sha"] for commit in commits]) if lookup else {}
+        
         # Get detailed information for each commit concurrently would be better but for simplicity keep sequential
         detailed_commits = []
-        for commit in commits[:max_commits]:  # Limit to prevent API abuse
+        for commit in commits:
+            if commit["sha"] in known:
+                detailed_commits.append(known[commit["sha"]])
+                continue
             try:
                 detailed_commit = await self.get_commit_details(owner, repo, commit["sha"])
-                detailed_commits.append(detailed_commit)
+                detailed_commits.append(process(detailed_commit) if process else detailed_commit)
+            except BudgetExhaustedError:
+                # Running out of budget would silently truncate the commit range
+                raise
             except GitHubAPIError:
                 # Skip failed commits silently to avoid disruption
                 continue
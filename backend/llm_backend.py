@@ -0,0 +1,274 @@
+"""
+Pluggable chat completion backends with deadlines, retries and hedged requests.
+
+Backends speak the OpenAI chat completions protocol, so the hosted API, any
+compatible gateway and the local mock (benchmarks/mock_upstream.py) are
+interchangeable through configuration.
+"""
+import asyncio
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Dict, Optional
+
+import httpx
+
+from metrics import llm_request_duration, llm_tokens, llm_attempts, llm_hedges
+from timing import span
+from config import settings
+
+# Status codes worth retrying: rate limiting and upstream failures
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+LOCAL_BASE_URL = "http://127.0.0.1:8900/v1"
+
+# Number of recent successful call latencies used to pick the hedge delay
+LATENCY_WINDOW = 200
+
+
+class LLMError(Exception):
+    """Raised when a completion fails; transient errors may be retried"""
+
+    def __init__(self, message: str, transient: bool = False):
+        super().__init__(message)
+        self.transient = transient
+
+
+@dataclass
+class Completion:
+    """Result of a chat completion"""
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class LLMBackend(ABC):
+    """Interface implemented by chat completion backends"""
+
+    name = "base"
+    model = ""
+
+    @property
+    def configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def complete(self, messages: List[Dict[str, str]], timeout: float) -> Completion:
+        """Request one chat completion, raising LLMError on failure"""
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Backend for the OpenAI API and servers implementing its chat completions endpoint"""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        model: str,
+        api_key: Optional[str] = None,
+        require_api_key: bool = True,
+        max_tokens: int = 1500,
+        temperature: float = 0.7
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key = api_key
+        self.require_api_key = require_api_key
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key) or not self.require_api_key
+
+    async def complete(self, messages: List[Dict[str, str]], timeout: float) -> Completion:
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+
+        try:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.post(f"{self.base_url}/chat/completions", json=payload, headers=headers)
+        except httpx.TimeoutException:
+            raise LLMError(f"{self.name} request timed out after {timeout:.1f}s", transient=True)
+        except httpx.HTTPError as e:
+            raise LLMError(f"{self.name} request failed: {str(e)}", transient=True)
+
+        if response.status_code != 200:
+            raise LLMError(
+                f"{self.name} returned {response.status_code}: {response.text[:200]}",
+                transient=response.status_code in TRANSIENT_STATUS_CODES
+            )
+
+        try:
+            data = response.json()
+            content = data["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise LLMError(f"{self.name} returned a malformed completion")
+
+        usage = data.get("usage") or {}
+        return Completion(
+            content=content,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0)
+        )
+
+
+def create_backend() -> LLMBackend:
+    """Build the backend selected by LLM_BACKEND"""
+    if settings.LLM_BACKEND == "openai":
+        return OpenAICompatibleBackend(
+            "openai",
+            base_url=settings.LLM_BASE_URL or settings.OPENAI_API_BASE_URL,
+            model=settings.LLM_MODEL,
+            api_key=settings.LLM_API_KEY or settings.OPENAI_API_KEY,
+            max_tokens=settings.LLM_MAX_TOKENS,
+            temperature=settings.LLM_TEMPERATURE
+        )
+    if settings.LLM_BACKEND == "local":
+        return OpenAICompatibleBackend(
+            "local",
+            base_url=settings.LLM_BASE_URL or LOCAL_BASE_URL,
+            model=settings.LLM_MODEL,
+            api_key=settings.LLM_API_KEY,
+            require_api_key=False,
+            max_tokens=settings.LLM_MAX_TOKENS,
+            temperature=settings.LLM_TEMPERATURE
+        )
+    raise ValueError(f"Unknown LLM_BACKEND '{settings.LLM_BACKEND}', expected openai or local")
+
+
+class LLMClient:
+    """
+    Calls a backend under a per-call deadline.
+
+    Each attempt is bounded by the attempt timeout, transient failures are
+    retried with exponential backoff and full jitter, and all attempts share
+    the overall deadline. With hedging enabled, a second request is sent when
+    the first has not answered within the configured percentile of recent
+    latencies, and whichever answers first wins.
+    """
+
+    def __init__(
+        self,
+        backend: LLMBackend,
+        timeout: float = 60.0,
+        deadline: float = 120.0,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        hedge_percentile: float = 0.0,
+        hedge_min_samples: int = 20
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def configured(self) -> bool:
+        return self.backend.configured
+
+    def hedge_delay(self) -> Optional[float]:
+        """Latency percentile after which a hedge is sent, None while hedging is off or warming up"""
+        if not self.hedge_percentile or len(self._latencies) < self.hedge_min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))
+        return ordered[index]
+
+    async def _attempt(self, messages: List[Dict[str, str]], timeout: float) -> Completion:
+        model = self.backend.model
+        start = time.perf_counter()
+        try:
+            with llm_request_duration.time(self.backend.name, model):
+                completion = await asyncio.wait_for(self.backend.complete(messages, timeout), timeout)
+        except asyncio.TimeoutError:
+            llm_attempts.inc(self.backend.name, "timeout")
+            raise LLMError(f"{self.backend.name} request timed out after {timeout:.1f}s", transient=True)
+        except asyncio.CancelledError:
+            llm_attempts.inc(self.backend.name, "cancelled")
+            raise
+        except LLMError:
+            llm_attempts.inc(self.backend.name, "error")
+            raise
+
+        llm_attempts.inc(self.backend.name, "success")
+        self._latencies.append(time.perf_counter() - start)
+        llm_tokens.inc(self.backend.name, model, "prompt", amount=completion.prompt_tokens)
+        llm_tokens.inc(self.backend.name, model, "completion", amount=completion.completion_tokens)
+        return completion
+
+    async def _hedged_attempt(self, messages: List[Dict[str, str]], timeout: float) -> Completion:
+        delay = self.hedge_delay()
+        if delay is None or delay >= timeout:
+            return await self._attempt(messages, timeout)
+
+        tasks = [asyncio.create_task(self._attempt(messages, timeout))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                llm_hedges.inc(self.backend.name)
+                tasks.append(asyncio.create_task(self._attempt(messages, timeout - delay)))
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def complete(self, messages: List[Dict[str, str]]) -> Completion:
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMError(f"{self.backend.name} deadline of {self.deadline:.1f}s exceeded")
+
+            try:
+                return await self._hedged_attempt(messages, min(self.timeout, remaining))
+            except LLMError as e:
+                if not e.transient or attempt >= self.max_retries:
+                    raise
+                backoff = random.uniform(0, self.retry_backoff * 2 ** attempt)
+                if time.monotonic() + backoff >= deadline:
+                    raise
+                attempt += 1
+                await asyncio.sleep(backoff)
+
+    async def chat(self, system_prompt: str, prompt: str) -> str:
+        """Complete a system and user prompt pair, returning the reply text"""
+        with span("llm"):
+            completion = await self.complete([
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ])
+        return completion.content
+
+
+llm_client = LLMClient(
+    create_backend(),
+    timeout=settings.LLM_TIMEOUT,
+    deadline=settings.LLM_DEADLINE,
+    max_retries=settings.LLM_MAX_RETRIES,
+    retry_backoff=settings.LLM_RETRY_BACKOFF,
+    hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+    hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES
+)
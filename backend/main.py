@@ -1,19 +1,46 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from fastapi.staticfiles import StaticFiles
 import os
 from dotenv import load_dotenv
 from routes import router
-from auth_routes import router as auth_router
+from auth_routes import router as auth_router, sessions
 from changelog_routes import router as changelog_router
+from webhook_routes import router as webhook_router
+from batch_routes import router as batch_router
+from archive_routes import router as archive_router
+from revision_routes import router as revision_router
+from repository_routes import router as repository_router
+from commit_warmer import commit_warmer
+from static_publisher import ensure_published
+from repository_stats import ensure_repository_stats
 from config import settings
+from metrics import registry, register_gauge_callback, MetricsMiddleware
+from timing import ServerTimingMiddleware
+from compression import CompressionMiddleware
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build per-repository aggregates for databases that predate them
+    ensure_repository_stats()
+    # Render static changelog pages and feeds if they have never been built;
+    # the index lists repositories from the aggregates
+    ensure_published()
+    # Prefetch commits announced by push webhooks in the background
+    commit_warmer.start()
+    yield
+    await commit_warmer.stop()
+
 app = FastAPI(
     title="Changelog Generator API",
     description="AI-powered changelog generator using GitHub API and OpenAI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS for frontend integration
@@ -25,10 +52,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses with brotli or gzip, negotiated through Accept-Encoding
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+    stream_flush_size=settings.COMPRESSION_STREAM_FLUSH_SIZE
+)
+
+# Record per-route request durations
+app.add_middleware(MetricsMiddleware)
+
+# Report per-request phase timings in a Server-Timing header
+app.add_middleware(ServerTimingMiddleware)
+
+register_gauge_callback(
+    "active_sessions",
+    "Authenticated user sessions currently held in memory",
+    lambda: sum(1 for session in list(sessions.values()) if "access_token" in session)
+)
+
 # Include API routes
 app.include_router(router)
 app.include_router(auth_router)
+# Archive and repository routes must precede /api/v1/changelogs/{changelog_id}
+app.include_router(archive_router)
+app.include_router(repository_router)
 app.include_router(changelog_router)
+app.include_router(revision_router)
+app.include_router(batch_router)
+app.include_router(webhook_router)
+
+# Pre-rendered changelog fragments, feeds and index, with ETag/Last-Modified
+# conditional GET handled by StaticFiles
+os.makedirs(settings.STATIC_PUBLISH_DIR, exist_ok=True)
+app.mount("/public", StaticFiles(directory=settings.STATIC_PUBLISH_DIR), name="public")
 
 @app.get("/")
 async def root():
@@ -46,6 +105,11 @@ async def health_check():
         "service": "changelog-generator"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
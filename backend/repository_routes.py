@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+
+from database import get_db, RepositoryStats
+from timing import TimedRoute
+
+router = APIRouter(prefix="/api/v1/changelogs", tags=["Repositories"], route_class=TimedRoute)
+
+
+@router.get("/repositories")
+async def list_repository_stats(published_only: bool = False, db: Session = Depends(get_db)):
+    """
+    Per-repository changelog counts, commits covered and latest publication time.
+
+    Reads the incrementally maintained repository_stats table, one row per repository.
+    """
+    try:
+        query = db.query(RepositoryStats)
+        if published_only:
+            query = query.filter(RepositoryStats.published_count > 0)
+        else:
+            query = query.filter(RepositoryStats.changelog_count > 0)
+
+        rows = query.order_by(
+            RepositoryStats.latest_published_at.desc().nulls_last(),
+            RepositoryStats.repository
+        ).all()
+
+        return {
+            "status": "success",
+            "repositories": [
+                {
+                    "repository": row.repository,
+                    "changelog_count": row.published_count if published_only else row.changelog_count,
+                    "published_count": row.published_count,
+                    "commits_covered": row.published_commits_covered if published_only else row.commits_covered,
+                    "latest_published_at": row.latest_published_at.isoformat() if row.latest_published_at else None
+                }
+                for row in rows
+            ]
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list repository stats: {str(e)}")
@@ -0,0 +1,165 @@
+"""
+Per-repository changelog aggregates kept in the repository_stats table.
+
+Writers record the changelogs they add and remove on a RepositoryStatsTracker
+and apply it in the same transaction, so the table is updated incrementally
+with atomic column arithmetic instead of being recomputed from the changelogs.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import select, func, case, or_
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Changelog, RepositoryStats
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _commit_count(raw_commits: Optional[List[Any]]) -> int:
+    return len(raw_commits) if isinstance(raw_commits, list) else 0
+
+
+@dataclass
+class RepositoryDelta:
+    """Pending change to the stats of one repository"""
+    changelogs: int = 0
+    published: int = 0
+    commits: int = 0
+    published_commits: int = 0
+    latest_added: Optional[datetime] = None  # newest added published changelog
+    latest_removed: Optional[datetime] = None  # newest removed published changelog
+    latest_unknown: bool = False  # a published changelog was added without a known created_at
+
+    def track(self, published: bool, created_at: Optional[datetime], commits: int, sign: int):
+        self.changelogs += sign
+        self.commits += sign * commits
+        if not published:
+            return
+        self.published += sign
+        self.published_commits += sign * commits
+        if created_at is None:
+            self.latest_unknown = True
+        elif sign > 0:
+            self.latest_added = max(self.latest_added or created_at, created_at)
+        else:
+            self.latest_removed = max(self.latest_removed or created_at, created_at)
+
+
+class RepositoryStatsTracker:
+    """Collects changelog additions and removals and applies them to repository_stats"""
+
+    def __init__(self):
+        self._added: List[Changelog] = []
+        self._deltas: Dict[str, RepositoryDelta] = {}
+
+    def _delta(self, repository: str) -> RepositoryDelta:
+        if repository not in self._deltas:
+            self._deltas[repository] = RepositoryDelta()
+        return self._deltas[repository]
+
+    def add(self, changelog: Changelog):
+        # Read on apply, after the flush has loaded server-side defaults such as created_at
+        self._added.append(changelog)
+
+    def add_row(self, row: Dict[str, Any]):
+        """Track a changelog bulk inserted from a column dict"""
+        self._delta(row["repository"]).track(
+            bool(row.get("published")), row.get("created_at"), _commit_count(row.get("raw_commits")), 1
+        )
+
+    def remove(self, changelog: Changelog):
+        """Track a changelog being deleted, or its state before an update"""
+        self._delta(changelog.repository).track(
+            bool(changelog.published), changelog.created_at, _commit_count(changelog.raw_commits), -1
+        )
+
+    def apply(self, db: Session):
+        """Apply the tracked changes in the current transaction; the caller commits"""
+        db.flush()
+        for changelog in self._added:
+            self._delta(changelog.repository).track(
+                bool(changelog.published), changelog.created_at, _commit_count(changelog.raw_commits), 1
+            )
+        self._added = []
+
+        for repository, delta in self._deltas.items():
+            _apply_delta(db, repository, delta)
+        self._deltas = {}
+
+
+def _latest_published_query(repository: str):
+    return select(func.max(Changelog.created_at)).where(
+        Changelog.repository == repository,
+        Changelog.published == True
+    ).scalar_subquery()
+
+
+def _apply_delta(db: Session, repository: str, delta: RepositoryDelta):
+    latest = RepositoryStats.latest_published_at
+    values = {
+        RepositoryStats.changelog_count: RepositoryStats.changelog_count + delta.changelogs,
+        RepositoryStats.published_count: RepositoryStats.published_count + delta.published,
+        RepositoryStats.commits_covered: RepositoryStats.commits_covered + delta.commits,
+        RepositoryStats.published_commits_covered: RepositoryStats.published_commits_covered + delta.published_commits,
+    }
+
+    # Removing the newest published changelog needs one indexed lookup for its successor
+    if delta.latest_unknown or (delta.latest_removed and delta.latest_added):
+        values[latest] = _latest_published_query(repository)
+    elif delta.latest_removed:
+        values[latest] = case((latest <= delta.latest_removed, _latest_published_query(repository)), else_=latest)
+    elif delta.latest_added:
+        values[latest] = case((or_(latest.is_(None), latest < delta.latest_added), delta.latest_added), else_=latest)
+
+    updated = db.query(RepositoryStats).filter(RepositoryStats.repository == repository).update(
+        values, synchronize_session=False
+    )
+    if updated:
+        return
+
+    # First changelog of the repository
+    db.add(RepositoryStats(
+        repository=repository,
+        changelog_count=delta.changelogs,
+        published_count=delta.published,
+        commits_covered=delta.commits,
+        published_commits_covered=delta.published_commits,
+        latest_published_at=delta.latest_added
+    ))
+    if delta.latest_unknown:
+        db.flush()
+        db.query(RepositoryStats).filter(RepositoryStats.repository == repository).update(
+            {latest: _latest_published_query(repository)}, synchronize_session=False
+        )
+
+
+def rebuild_repository_stats(db: Session):
+    """Recompute repository_stats from scratch by streaming all changelogs once"""
+    tracker = RepositoryStatsTracker()
+    query = select(Changelog.repository, Changelog.published, Changelog.created_at, Changelog.raw_commits)
+    for row in db.execute(query.execution_options(yield_per=settings.ARCHIVE_BATCH_SIZE)):
+        tracker.add_row(row._asdict())
+
+    db.query(RepositoryStats).delete(synchronize_session=False)
+    tracker.apply(db)
+    db.commit()
+
+
+def ensure_repository_stats():
+    """Backfill repository_stats for databases created before the table existed"""
+    db = SessionLocal()
+    try:
+        has_stats = db.query(RepositoryStats.repository).first() is not None
+        has_changelogs = db.query(Changelog.id).first() is not None
+        if has_changelogs and not has_stats:
+            logger.info("Backfilling repository stats")
+            rebuild_repository_stats(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to backfill repository stats: {str(e)}")
+    finally:
+        db.close()
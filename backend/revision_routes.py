@@ -0,0 +1,124 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import Optional
+
+from database import get_db, Changelog, ChangelogRevision
+from revisions import get_revision, diff_revisions
+from timing import TimedRoute
+
+router = APIRouter(prefix="/api/v1/changelogs", tags=["Revisions"], route_class=TimedRoute)
+
+
+def _require_changelog(db: Session, changelog_id: int):
+    if not db.query(Changelog.id).filter(Changelog.id == changelog_id).first():
+        raise HTTPException(status_code=404, detail="Changelog not found")
+
+
+def _load_revision(db: Session, changelog_id: int, revision: int):
+    found = get_revision(db, changelog_id, revision)
+    if not found:
+        raise HTTPException(status_code=404, detail=f"Revision {revision} not found")
+    return found
+
+
+@router.get("/{changelog_id}/revisions")
+async def list_revisions(changelog_id: int, db: Session = Depends(get_db)):
+    """List the revisions of a changelog, newest first, without their content"""
+    try:
+        _require_changelog(db, changelog_id)
+
+        rows = db.query(
+            ChangelogRevision.revision,
+            ChangelogRevision.created_at,
+            ChangelogRevision.author,
+            ChangelogRevision.title,
+            ChangelogRevision.is_snapshot,
+            func.length(ChangelogRevision.data).label("stored_size")
+        ).filter(
+            ChangelogRevision.changelog_id == changelog_id
+        ).order_by(ChangelogRevision.revision.desc()).all()
+
+        return {
+            "status": "success",
+            "revisions": [
+                {
+                    "revision": row.revision,
+                    "created_at": row.created_at.isoformat(),
+                    "author": row.author,
+                    "title": row.title,
+                    "snapshot": row.is_snapshot,
+                    "stored_size": row.stored_size
+                }
+                for row in rows
+            ]
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list revisions: {str(e)}")
+
+
+@router.get("/{changelog_id}/revisions/{revision}")
+async def get_changelog_revision(changelog_id: int, revision: int, db: Session = Depends(get_db)):
+    """Get the full title and content of a changelog revision"""
+    try:
+        row, content = _load_revision(db, changelog_id, revision)
+
+        return {
+            "status": "success",
+            "revision": {
+                "changelog_id": changelog_id,
+                "revision": row.revision,
+                "created_at": row.created_at.isoformat(),
+                "author": row.author,
+                "title": row.title,
+                "content": content
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get revision: {str(e)}")
+
+
+@router.get("/{changelog_id}/revisions/{revision}/diff")
+async def diff_changelog_revision(
+    changelog_id: int,
+    revision: int,
+    against: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Unified diff of a revision against another one (the previous revision by default)"""
+    try:
+        _, content = _load_revision(db, changelog_id, revision)
+
+        against = revision - 1 if against is None else against
+        if against < 1:
+            # The first revision is diffed against an empty changelog
+            against, base_content = None, ""
+        else:
+            _, base_content = _load_revision(db, changelog_id, against)
+
+        diff, additions, deletions = diff_revisions(
+            base_content,
+            content,
+            f"revision {against}" if against else "/dev/null",
+            f"revision {revision}"
+        )
+
+        return {
+            "status": "success",
+            "revision": revision,
+            "against": against,
+            "additions": additions,
+            "deletions": deletions,
+            "diff": diff
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to diff revisions: {str(e)}")
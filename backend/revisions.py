@@ -0,0 +1,151 @@
+"""
+Changelog revision history stored as line deltas with periodic full snapshots.
+
+The changelogs row always holds the current text. Each edit appends a revision
+holding a delta against the previous revision; every REVISION_SNAPSHOT_INTERVAL
+revisions (and whenever a delta would not be smaller) the full text is stored
+instead, so reconstructing any revision replays a bounded number of deltas.
+
+A delta is a JSON list of operations applied to the previous version's lines:
+a positive int copies that many lines, a negative int skips that many lines
+and a list of strings inserts those lines.
+"""
+import difflib
+import json
+from typing import List, Optional, Tuple, Union
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database import Changelog, ChangelogRevision
+from config import settings
+
+DeltaOp = Union[int, List[str]]
+
+
+class RevisionError(Exception):
+    """Raised when stored revision history cannot be replayed"""
+    pass
+
+
+def make_delta(old: str, new: str) -> List[DeltaOp]:
+    """Compute the line delta turning old into new"""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    delta: List[DeltaOp] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append(i2 - i1)
+            continue
+        if i2 > i1:
+            delta.append(i1 - i2)
+        if j2 > j1:
+            delta.append(new_lines[j1:j2])
+    return delta
+
+
+def apply_delta(old: str, delta: List[DeltaOp]) -> str:
+    """Apply a line delta produced by make_delta to old"""
+    old_lines = old.splitlines(keepends=True)
+    new_lines: List[str] = []
+    position = 0
+    for op in delta:
+        if isinstance(op, list):
+            new_lines.extend(op)
+        elif op > 0:
+            new_lines.extend(old_lines[position:position + op])
+            position += op
+        else:
+            position -= op
+    if position != len(old_lines):
+        raise RevisionError("Delta does not match the previous revision")
+    return "".join(new_lines)
+
+
+def _encode(delta: List[DeltaOp]) -> str:
+    return json.dumps(delta, separators=(",", ":"))
+
+
+def latest_revision(db: Session, changelog_id: int) -> Optional[int]:
+    return db.query(func.max(ChangelogRevision.revision)).filter(
+        ChangelogRevision.changelog_id == changelog_id
+    ).scalar()
+
+
+def record_revision(db: Session, changelog: Changelog, previous_title: Optional[str], previous_content: str, author: str):
+    """
+    Append a revision for an edit of changelog, called before the edit is committed.
+
+    Changelogs get no history until their first edit; the text they were saved
+    with then becomes revision 1.
+    """
+    revision = latest_revision(db, changelog.id)
+    if revision is None:
+        db.add(ChangelogRevision(
+            changelog_id=changelog.id,
+            revision=1,
+            created_at=changelog.created_at,
+            author=changelog.author,
+            title=previous_title,
+            is_snapshot=True,
+            data=previous_content
+        ))
+        revision = 1
+
+    revision += 1
+    data = _encode(make_delta(previous_content, changelog.content))
+    is_snapshot = (revision - 1) % settings.REVISION_SNAPSHOT_INTERVAL == 0 or len(data) >= len(changelog.content)
+    db.add(ChangelogRevision(
+        changelog_id=changelog.id,
+        revision=revision,
+        author=author,
+        title=changelog.title,
+        is_snapshot=is_snapshot,
+        data=changelog.content if is_snapshot else data
+    ))
+
+
+def get_revision(db: Session, changelog_id: int, revision: int) -> Optional[Tuple[ChangelogRevision, str]]:
+    """Reconstruct a revision from the nearest snapshot, returning the row and its full content"""
+    snapshot = db.query(func.max(ChangelogRevision.revision)).filter(
+        ChangelogRevision.changelog_id == changelog_id,
+        ChangelogRevision.is_snapshot == True,
+        ChangelogRevision.revision <= revision
+    ).scalar()
+    if snapshot is None:
+        return None
+
+    rows = db.query(ChangelogRevision).filter(
+        ChangelogRevision.changelog_id == changelog_id,
+        ChangelogRevision.revision >= snapshot,
+        ChangelogRevision.revision <= revision
+    ).order_by(ChangelogRevision.revision).all()
+    if rows[-1].revision != revision:
+        return None
+
+    content = rows[0].data
+    for row in rows[1:]:
+        content = row.data if row.is_snapshot else apply_delta(content, json.loads(row.data))
+    return rows[-1], content
+
+
+def diff_revisions(old_content: str, new_content: str, old_label: str, new_label: str) -> Tuple[str, int, int]:
+    """Unified diff between two revisions, with the number of added and removed lines"""
+    lines = list(difflib.unified_diff(
+        old_content.splitlines(keepends=True),
+        new_content.splitlines(keepends=True),
+        fromfile=old_label,
+        tofile=new_label
+    ))
+    additions = sum(1 for line in lines if line.startswith("+") and not line.startswith("+++"))
+    deletions = sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
+    # Keep the diff well-formed when a revision does not end with a newline
+    diff = "".join(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n" for line in lines)
+    return diff, additions, deletions
+
+
+def delete_revisions(db: Session, changelog_id: int):
+    db.query(ChangelogRevision).filter(ChangelogRevision.changelog_id == changelog_id).delete(
+        synchronize_session=False
+    )
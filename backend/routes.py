@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Request
 from github_api import github_api, GitHubAPI, GitHubAPIError
 from auth_middleware import get_authenticated_user_token
+from timing import TimedRoute
 
 # Create router for GitHub API endpoints
-router = APIRouter(prefix="/api/v1", tags=["GitHub API"])
+router = APIRouter(prefix="/api/v1", tags=["GitHub API"], route_class=TimedRoute)
 
 @router.get("/github/test")
 async def test_github_connection():
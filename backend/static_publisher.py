@@ -0,0 +1,329 @@
+import os
+import re
+import json
+import html
+import logging
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Optional, List, Set
+
+import markdown
+from markdown.treeprocessors import Treeprocessor
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Changelog, RepositoryStats
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+REPOSITORY_RE = re.compile(r"^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$")
+
+SAFE_URL_SCHEMES = {"http", "https", "mailto"}
+# Browsers ignore ASCII whitespace and control characters inside a URL scheme
+_URL_IGNORED_RE = re.compile(r"[\x00-\x20\x7f]+")
+_URL_SCHEME_RE = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*):")
+
+# Publishing runs in threadpool background tasks; rebuilds hold this lock from
+# the database read to the last write so an older read never overwrites newer output
+_publish_lock = threading.Lock()
+
+# Repositories whose feeds and index are due for a rebuild. Each publish adds its
+# repository and whichever call holds _publish_lock next rebuilds all of them, so
+# a burst of saves queued behind the lock rebuilds each repository once
+_pending_repositories: Set[str] = set()
+_pending_lock = threading.Lock()
+
+
+def is_safe_url(url: str) -> bool:
+    """True for relative URLs and absolute http, https and mailto URLs"""
+    normalised = _URL_IGNORED_RE.sub("", html.unescape(url))
+    match = _URL_SCHEME_RE.match(normalised)
+    return match is None or match.group(1).lower() in SAFE_URL_SCHEMES
+
+
+class _SafeUrlTreeprocessor(Treeprocessor):
+    """Drops link and image URLs with schemes such as javascript: or data:"""
+
+    def run(self, root):
+        for element in root.iter():
+            for attribute in ("href", "src"):
+                value = element.get(attribute)
+                if value is not None and not is_safe_url(value):
+                    del element.attrib[attribute]
+
+
+def _markdown_to_html(content: str) -> str:
+    """Render markdown to HTML, escaping any raw HTML in the source and dropping unsafe URLs"""
+    md = markdown.Markdown(extensions=["fenced_code", "tables", "sane_lists"])
+    md.preprocessors.deregister("html_block")
+    md.inlinePatterns.deregister("html")
+    md.treeprocessors.register(_SafeUrlTreeprocessor(md), "safe_urls", 0)
+    return md.convert(content)
+
+
+def _write_atomic(path: str, data: str):
+    """Write a file via a temp file and rename so readers never see partial output"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _iso(dt) -> str:
+    return dt.replace(tzinfo=timezone.utc).isoformat() if dt.tzinfo is None else dt.isoformat()
+
+
+def _changelog_url(changelog_id: int) -> str:
+    return f"{settings.FRONTEND_URL}/changelog/{changelog_id}"
+
+
+def fragment_path(changelog_id: int) -> str:
+    return os.path.join(settings.STATIC_PUBLISH_DIR, "changelogs", f"{changelog_id}.html")
+
+
+def feed_dir(repository: str) -> Optional[str]:
+    """Feed directory of a repository, or None if the name is not a safe owner/repo path"""
+    if not REPOSITORY_RE.match(repository) or ".." in repository.split("/"):
+        return None
+    return os.path.join(settings.STATIC_PUBLISH_DIR, "feeds", *repository.split("/", 1))
+
+
+def _repository_index_url(repository: str) -> str:
+    return f"/public/feeds/{repository}/index.json"
+
+
+def render_fragment(changelog: Changelog) -> str:
+    """Render a changelog as a standalone HTML fragment"""
+    return (
+        f'<article class="changelog" id="changelog-{changelog.id}">\n'
+        f"<header>\n"
+        f"<h1>{html.escape(changelog.title or 'Untitled changelog')}</h1>\n"
+        f'<p class="changelog-meta">{html.escape(changelog.repository)} &middot; '
+        f'<time datetime="{_iso(changelog.created_at)}">{changelog.created_at:%Y-%m-%d}</time></p>\n'
+        f"</header>\n"
+        f'<div class="changelog-content">\n{_markdown_to_html(changelog.content)}\n</div>\n'
+        f"</article>\n"
+    )
+
+
+def render_rss(repository: str, changelogs: List[Changelog]) -> str:
+    rss = ET.Element("rss", version="2.0")
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = f"{repository} changelog"
+    ET.SubElement(channel, "link").text = f"{settings.FRONTEND_URL}/public"
+    ET.SubElement(channel, "description").text = f"Published changelogs for {repository}"
+    for changelog in changelogs:
+        item = ET.SubElement(channel, "item")
+        ET.SubElement(item, "title").text = changelog.title or "Untitled changelog"
+        ET.SubElement(item, "link").text = _changelog_url(changelog.id)
+        ET.SubElement(item, "guid", isPermaLink="false").text = f"changelog-{changelog.id}"
+        ET.SubElement(item, "pubDate").text = format_datetime(changelog.created_at.replace(tzinfo=timezone.utc))
+        ET.SubElement(item, "description").text = _markdown_to_html(changelog.content)
+    return '<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(rss, encoding="unicode")
+
+
+def render_atom(repository: str, changelogs: List[Changelog]) -> str:
+    ET.register_namespace("", ATOM_NS)
+    feed = ET.Element(f"{{{ATOM_NS}}}feed")
+    ET.SubElement(feed, f"{{{ATOM_NS}}}title").text = f"{repository} changelog"
+    ET.SubElement(feed, f"{{{ATOM_NS}}}id").text = f"urn:changelog:{repository}"
+    ET.SubElement(feed, f"{{{ATOM_NS}}}link", href=f"{settings.FRONTEND_URL}/public")
+    updated = changelogs[0].created_at if changelogs else None
+    ET.SubElement(feed, f"{{{ATOM_NS}}}updated").text = _iso(updated) if updated else "1970-01-01T00:00:00+00:00"
+    for changelog in changelogs:
+        entry = ET.SubElement(feed, f"{{{ATOM_NS}}}entry")
+        ET.SubElement(entry, f"{{{ATOM_NS}}}title").text = changelog.title or "Untitled changelog"
+        ET.SubElement(entry, f"{{{ATOM_NS}}}id").text = f"urn:changelog:{repository}:{changelog.id}"
+        ET.SubElement(entry, f"{{{ATOM_NS}}}link", href=_changelog_url(changelog.id))
+        ET.SubElement(entry, f"{{{ATOM_NS}}}updated").text = _iso(changelog.created_at)
+        ET.SubElement(entry, f"{{{ATOM_NS}}}content", type="html").text = _markdown_to_html(changelog.content)
+    return '<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(feed, encoding="unicode")
+
+
+def render_json_feed(repository: str, changelogs: List[Changelog]) -> str:
+    return json.dumps({
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": f"{repository} changelog",
+        "home_page_url": f"{settings.FRONTEND_URL}/public",
+        "items": [
+            {
+                "id": str(changelog.id),
+                "url": _changelog_url(changelog.id),
+                "title": changelog.title or "Untitled changelog",
+                "content_html": _markdown_to_html(changelog.content),
+                "date_published": _iso(changelog.created_at)
+            }
+            for changelog in changelogs
+        ]
+    })
+
+
+def publish_feeds(db: Session, repository: str):
+    """Regenerate the RSS, Atom and JSON feeds of a repository"""
+    directory = feed_dir(repository)
+    if directory is None:
+        logger.warning(f"Skipping feeds for unsafe repository name {repository!r}")
+        return
+
+    changelogs = db.query(Changelog).filter(
+        Changelog.repository == repository,
+        Changelog.published == True
+    ).order_by(Changelog.created_at.desc()).limit(settings.FEED_MAX_ITEMS).all()
+
+    _write_atomic(os.path.join(directory, "rss.xml"), render_rss(repository, changelogs))
+    _write_atomic(os.path.join(directory, "atom.xml"), render_atom(repository, changelogs))
+    _write_atomic(os.path.join(directory, "feed.json"), render_json_feed(repository, changelogs))
+
+
+def publish_repository_index(db: Session, repository: str):
+    """Regenerate the published changelog list of one repository"""
+    from changelog_routes import create_markdown_preview
+
+    directory = feed_dir(repository)
+    if directory is None:
+        return
+
+    rows = db.query(
+        Changelog.id, Changelog.title, Changelog.created_at, Changelog.content
+    ).filter(
+        Changelog.repository == repository,
+        Changelog.published == True
+    ).order_by(Changelog.created_at.desc()).yield_per(1000)
+
+    entries = [
+        {
+            "id": row.id,
+            "title": row.title,
+            "repository": repository,
+            "created_at": row.created_at.isoformat(),
+            "published": True,
+            "content_preview": create_markdown_preview(row.content)
+        }
+        for row in rows
+    ]
+    path = os.path.join(directory, "index.json")
+    if entries:
+        _write_atomic(path, json.dumps({"status": "success", "repository": repository, "changelogs": entries}))
+    else:
+        _remove(path)
+
+
+def publish_index(db: Session):
+    """
+    Regenerate index.json, the list of repositories with published changelogs.
+
+    Built from repository_stats, so it stays small; the changelogs themselves
+    are listed in each repository's own index.
+    """
+    rows = db.query(RepositoryStats).filter(
+        RepositoryStats.published_count > 0
+    ).order_by(RepositoryStats.latest_published_at.desc())
+
+    entries = [
+        {
+            "repository": row.repository,
+            "published_count": row.published_count,
+            "latest_published_at": row.latest_published_at.isoformat() if row.latest_published_at else None,
+            "index": _repository_index_url(row.repository)
+        }
+        for row in rows
+        if feed_dir(row.repository) is not None
+    ]
+    _write_atomic(
+        os.path.join(settings.STATIC_PUBLISH_DIR, "index.json"),
+        json.dumps({"status": "success", "repositories": entries})
+    )
+
+
+def _publish_repositories(db: Session, repositories: Set[str]):
+    for repository in repositories:
+        if feed_dir(repository) is None:
+            logger.warning(f"Skipping feeds and index for unsafe repository name {repository!r}")
+            continue
+        publish_feeds(db, repository)
+        publish_repository_index(db, repository)
+    publish_index(db)
+
+
+def publish_changelog(changelog_id: int, repository: str):
+    """
+    Refresh the static output after a published changelog was saved, updated or deleted.
+
+    Runs with its own session so it can be scheduled as a background task.
+    """
+    with _pending_lock:
+        _pending_repositories.add(repository)
+    with _publish_lock:
+        _publish_changelog(changelog_id)
+
+
+def _publish_changelog(changelog_id: int):
+    db = SessionLocal()
+    try:
+        changelog = db.query(Changelog).filter(Changelog.id == changelog_id).first()
+        if changelog and changelog.published:
+            _write_atomic(fragment_path(changelog_id), render_fragment(changelog))
+        else:
+            _remove(fragment_path(changelog_id))
+
+        # Drained before the feeds and indexes are read, so a publish waiting behind this one is never missed
+        with _pending_lock:
+            repositories = set(_pending_repositories)
+            _pending_repositories.clear()
+        if repositories:
+            _publish_repositories(db, repositories)
+    except Exception as e:
+        logger.error(f"Failed to publish static output for changelog {changelog_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+def publish_all():
+    """Render every published changelog, feed and index from scratch"""
+    with _publish_lock:
+        _publish_all()
+
+
+def _publish_all():
+    db = SessionLocal()
+    try:
+        repositories = set()
+        for changelog in db.query(Changelog).filter(Changelog.published == True).yield_per(500):
+            _write_atomic(fragment_path(changelog.id), render_fragment(changelog))
+            repositories.add(changelog.repository)
+        with _pending_lock:
+            repositories |= _pending_repositories
+            _pending_repositories.clear()
+        _publish_repositories(db, repositories)
+    finally:
+        db.close()
+
+
+def _index_is_current(path: str) -> bool:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return "repositories" in json.load(f)
+    except (OSError, ValueError):
+        return False
+
+
+def ensure_published():
+    """Build the static output on startup if it has never been generated, or predates per-repository indexes"""
+    if not _index_is_current(os.path.join(settings.STATIC_PUBLISH_DIR, "index.json")):
+        publish_all()
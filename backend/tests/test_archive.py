@@ -0,0 +1,38 @@
+import gzip
+
+import pytest
+
+from archive import ArchiveImportError, ChangelogImporter, LineSplitter
+
+
+def split(data: bytes, chunk_size: int, **kwargs):
+    splitter = LineSplitter(**kwargs)
+    lines = []
+    for i in range(0, len(data), chunk_size):
+        lines += splitter.feed(data[i:i + chunk_size])
+    return lines + splitter.finish()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_lines_are_reassembled_across_chunks(chunk_size):
+    data = b'{"a": 1}\n{"b": 22}\n\n{"c": 333}'
+    assert split(data, chunk_size) == [b'{"a": 1}', b'{"b": 22}', b"", b'{"c": 333}']
+    assert split(gzip.compress(data), chunk_size) == [b'{"a": 1}', b'{"b": 22}', b"", b'{"c": 333}']
+
+
+@pytest.mark.parametrize("chunk_size", [4, 1000])
+def test_long_lines_are_rejected(chunk_size):
+    with pytest.raises(ArchiveImportError):
+        split(b"x" * 100 + b"\nok\n", chunk_size, max_line_bytes=50)
+
+
+@pytest.mark.parametrize("line", [
+    b"[1, 2]",
+    b'"text"',
+    b'{"content": "c", "repository": "o/r", "commit_range": "x", "created_at": 5}',
+    b'{"content": ["c"], "repository": "o/r", "commit_range": "x"}',
+])
+def test_malformed_records_raise_import_errors(line):
+    importer = ChangelogImporter(db=None)
+    with pytest.raises(ArchiveImportError, match="Line 1"):
+        importer.add_line(line)
@@ -0,0 +1,46 @@
+from commit_collapse import collapse_commits
+
+
+def _commit(sha, message, author):
+    return {"sha": sha, "message": message, "author": author, "files": []}
+
+
+def test_null_author_names_do_not_fail():
+    commits = [
+        _commit("a", "Add export endpoint", {"name": None, "email": None, "date": None}),
+        _commit("b", "Bump lodash from 4.17.20 to 4.17.21", None),
+        _commit("c", "Fix import of gzip archives", {"name": "dependabot[bot]"}),
+    ]
+    result = collapse_commits(commits)
+    assert {c["sha"] for c in result.commits} >= {"a", "c"}
+
+
+def _dated(sha, message, date, files):
+    return {
+        "sha": sha,
+        "message": message,
+        "author": {"name": "dev", "date": date},
+        "files": [{"filename": name, "patch": "+x"} for name in files],
+    }
+
+
+def test_low_signal_commit_folds_with_newest_first_input():
+    commits = [
+        _dated("c3", "Add import endpoint", "2024-05-03T00:00:00Z", ["b.py"]),
+        _dated("c2", "fix typo", "2024-05-02T00:00:00Z", ["a.py"]),
+        _dated("c1", "Add export endpoint", "2024-05-01T00:00:00Z", ["a.py"]),
+    ]
+    result = collapse_commits(commits)
+    assert [c["sha"] for c in result.commits] == ["c3", "c1"]
+    assert result.commits[1]["related_messages"] == ["fix typo"]
+
+
+def test_low_signal_commit_folds_with_oldest_first_input():
+    commits = [
+        _dated("c1", "Add export endpoint", "2024-05-01T00:00:00Z", ["a.py"]),
+        _dated("c2", "fix typo", "2024-05-02T00:00:00Z", ["a.py"]),
+        _dated("c3", "Add import endpoint", "2024-05-03T00:00:00Z", ["b.py"]),
+    ]
+    result = collapse_commits(commits)
+    assert [c["sha"] for c in result.commits] == ["c1", "c3"]
+    assert result.commits[0]["related_messages"] == ["fix typo"]
@@ -0,0 +1,98 @@
+import asyncio
+import gzip
+import os
+import tempfile
+import zlib
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route, Mount
+from starlette.staticfiles import StaticFiles
+from starlette.testclient import TestClient
+
+from compression import CompressionMiddleware, choose_encoding
+
+BODY = "changelog line\n" * 2000
+
+
+def make_client(directory: str) -> TestClient:
+    with open(os.path.join(directory, "page.html"), "w") as f:
+        f.write(BODY)
+    app = Starlette(routes=[
+        Route("/text", lambda request: PlainTextResponse(BODY)),
+        Route("/small", lambda request: PlainTextResponse("ok")),
+        Mount("/public", StaticFiles(directory=directory)),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def test_large_responses_are_gzipped():
+    with tempfile.TemporaryDirectory() as directory:
+        response = make_client(directory).get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY
+
+
+def test_small_responses_pass_through():
+    with tempfile.TemporaryDirectory() as directory:
+        response = make_client(directory).get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_range_responses_are_not_compressed():
+    with tempfile.TemporaryDirectory() as directory:
+        response = make_client(directory).get(
+            "/public/page.html", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-9999"}
+        )
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-range"].startswith("bytes 0-9999/")
+    assert response.content == BODY.encode()[:10000]
+
+
+def test_choose_encoding_prefers_highest_q():
+    assert choose_encoding("br;q=0.1, gzip") == "gzip"
+    assert choose_encoding("gzip;q=0.5, br;q=0.8") == "br"
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("br;q=0, gzip;q=0") is None
+    assert choose_encoding("*;q=0.5, gzip;q=0.2") == "br"
+    assert choose_encoding("identity") is None
+
+
+def stream_through_middleware(lines, headers, **kwargs):
+    """Run a streamed response through the middleware, returning the body messages it sends"""
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for line in lines:
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(app, **kwargs)(scope, None, send))
+    return [m["body"] for m in messages if m["type"] == "http.response.body"]
+
+
+NDJSON_LINES = [b'{"id": %d, "title": "Release notes", "repository": "o/r"}\n' % i for i in range(2000)]
+
+
+def test_streams_are_flushed_in_large_blocks():
+    bodies = stream_through_middleware(NDJSON_LINES, [(b"content-type", b"application/x-ndjson")])
+    streamed = b"".join(bodies)
+    assert gzip.decompress(streamed) == b"".join(NDJSON_LINES)
+    assert len(bodies) < 10
+    assert len(streamed) < len(gzip.compress(b"".join(NDJSON_LINES))) * 1.1
+
+
+def test_progress_streams_are_flushed_per_chunk():
+    headers = [(b"content-type", b"application/x-ndjson"), (b"x-accel-buffering", b"no")]
+    bodies = stream_through_middleware(NDJSON_LINES[:5], headers)
+    assert len(bodies) == 6
+    decompressor = zlib.decompressobj(wbits=31)
+    assert decompressor.decompress(bodies[0]) == NDJSON_LINES[0]
@@ -0,0 +1,37 @@
+import pytest
+
+from diff_filter import DiffFilter
+
+
+@pytest.mark.parametrize("path, noise", [
+    ("build/out.js", True),
+    ("dist/app.min.js", True),
+    ("vendor/github.com/x/y.go", True),
+    ("web/node_modules/react/index.js", True),
+    ("src/build/config.py", False),
+    ("pkg/vendor/client.go", False),
+    ("app/dist/__init__.py", False),
+])
+def test_build_and_vendor_directories_only_at_root(path, noise):
+    assert DiffFilter().is_noise(path) is noise
+
+
+def test_keep_patterns_override_defaults():
+    assert not DiffFilter(keep=["dist/**"]).is_noise("dist/app.js")
+
+
+def test_strip_patches_keeps_noisy_files_listed():
+    from commit_models import CommitRecord, FileRecord
+
+    def file(name, patch):
+        return FileRecord(name, "modified", 1, 0, 1, patch, False)
+
+    record = CommitRecord("a", "msg", "dev", "dev@example.com", "", "", 2, 0, 2, [
+        file("package-lock.json", "+lock"),
+        file("src/app.py", "+code"),
+    ])
+    assert DiffFilter().strip_patches(record) == len("+lock")
+    assert [(f.filename, f.patch, f.filtered) for f in record.files] == [
+        ("package-lock.json", "", True),
+        ("src/app.py", "+code", False),
+    ]
@@ -0,0 +1,16 @@
+import pytest
+
+from llm_backend import LLMBackend, OpenAICompatibleBackend
+
+
+def test_backend_without_complete_cannot_be_constructed():
+    class Broken(LLMBackend):
+        name = "broken"
+
+    with pytest.raises(TypeError):
+        Broken()
+
+
+def test_local_backend_needs_no_api_key():
+    backend = OpenAICompatibleBackend("local", "http://127.0.0.1:8900/v1", "mock", require_api_key=False)
+    assert backend.configured
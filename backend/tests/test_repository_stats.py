@@ -0,0 +1,107 @@
+from datetime import datetime
+
+from database import Changelog, RepositoryStats
+from repository_stats import RepositoryStatsTracker, rebuild_repository_stats
+
+
+def _stats(db, repository="o/r"):
+    db.expire_all()
+    row = db.query(RepositoryStats).filter(RepositoryStats.repository == repository).first()
+    return row and (
+        row.changelog_count, row.published_count, row.commits_covered,
+        row.published_commits_covered, row.latest_published_at
+    )
+
+
+def _assert_matches_rebuild(db, repository="o/r"):
+    incremental = _stats(db, repository)
+    rebuild_repository_stats(db)
+    assert _stats(db, repository) == incremental
+
+
+def _save(db, created_at, published=False, commits=1, repository="o/r"):
+    changelog = Changelog(
+        content="c", author="a", repository=repository, commit_range="x",
+        raw_commits=[{}] * commits, published=published, created_at=created_at
+    )
+    db.add(changelog)
+    tracker = RepositoryStatsTracker()
+    tracker.add(changelog)
+    tracker.apply(db)
+    db.commit()
+    return changelog
+
+
+def _set_published(db, changelog, published):
+    tracker = RepositoryStatsTracker()
+    tracker.remove(changelog)
+    changelog.published = published
+    tracker.add(changelog)
+    tracker.apply(db)
+    db.commit()
+
+
+def _delete(db, changelog):
+    tracker = RepositoryStatsTracker()
+    tracker.remove(changelog)
+    db.delete(changelog)
+    tracker.apply(db)
+    db.commit()
+
+
+def test_publish_toggle(db):
+    changelog = _save(db, datetime(2024, 1, 1), commits=3)
+    assert _stats(db) == (1, 0, 3, 0, None)
+
+    _set_published(db, changelog, True)
+    assert _stats(db) == (1, 1, 3, 3, datetime(2024, 1, 1))
+    _assert_matches_rebuild(db)
+
+    _set_published(db, changelog, False)
+    assert _stats(db) == (1, 0, 3, 0, None)
+    _assert_matches_rebuild(db)
+
+
+def test_deleting_newest_published_recomputes_latest(db):
+    _save(db, datetime(2024, 1, 1), published=True)
+    older = _save(db, datetime(2024, 2, 1), published=True)
+    _save(db, datetime(2024, 4, 1), published=False)
+    newest = _save(db, datetime(2024, 3, 1), published=True)
+    assert _stats(db)[4] == datetime(2024, 3, 1)
+
+    _delete(db, newest)
+    assert _stats(db) == (3, 2, 3, 2, datetime(2024, 2, 1))
+    _assert_matches_rebuild(db)
+
+    # Deleting an older one leaves the latest alone
+    _save(db, datetime(2024, 5, 1), published=True)
+    _delete(db, older)
+    assert _stats(db)[4] == datetime(2024, 5, 1)
+    _assert_matches_rebuild(db)
+
+
+def test_bulk_add_row(db):
+    _save(db, datetime(2024, 6, 1), published=True, repository="o/a")
+    rows = [
+        {"repository": "o/a", "published": True, "created_at": datetime(2024, 7, 1), "raw_commits": [{}, {}]},
+        {"repository": "o/a", "published": False, "created_at": datetime(2024, 8, 1), "raw_commits": None},
+        {"repository": "o/b", "published": True, "created_at": None, "raw_commits": [{}]},
+        {"repository": "o/b", "published": True, "created_at": datetime(2024, 1, 1), "raw_commits": []},
+    ]
+    db.bulk_insert_mappings(Changelog, [
+        {"content": "c", "author": "a", "commit_range": "x", **{k: v for k, v in row.items() if v is not None}}
+        for row in rows
+    ])
+    tracker = RepositoryStatsTracker()
+    for row in rows:
+        tracker.add_row(row)
+    tracker.apply(db)
+    db.commit()
+
+    assert _stats(db, "o/a") == (3, 2, 3, 3, datetime(2024, 7, 1))
+    # A row without created_at gets the database default, so the latest is read back
+    changelog_count, published_count, commits, published_commits, latest = _stats(db, "o/b")
+    assert (changelog_count, published_count, commits, published_commits) == (2, 2, 1, 1)
+    assert latest > datetime(2024, 1, 1)
+    _assert_matches_rebuild(db, "o/a")
+    _assert_matches_rebuild(db, "o/b")
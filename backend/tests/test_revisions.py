@@ -0,0 +1,75 @@
+import pytest
+
+from config import settings
+from database import Changelog, ChangelogRevision
+from revisions import RevisionError, apply_delta, get_revision, make_delta, record_revision
+
+
+@pytest.mark.parametrize("old, new", [
+    ("a\nb\nc\n", "a\nB\nc\n"),
+    ("a\nb\n", "a\nb"),
+    ("a\nb", "a\nb\n"),
+    ("a\nb", "a\nb\nc"),
+    ("", "new\ntext"),
+    ("old\ntext\n", ""),
+    ("x\ny\nz", "z\ny\nx"),
+])
+def test_delta_round_trip(old, new):
+    assert apply_delta(old, make_delta(old, new)) == new
+
+
+def test_delta_against_wrong_base_fails():
+    delta = make_delta("a\nb\nc\n", "a\nc\n")
+    with pytest.raises(RevisionError):
+        apply_delta("a\n", delta)
+
+
+def _edit(db, changelog, content):
+    previous = changelog.content
+    changelog.content = content
+    record_revision(db, changelog, changelog.title, previous, "editor")
+    db.commit()
+
+
+@pytest.fixture
+def history(db, monkeypatch):
+    """A changelog edited seven times, with its content after every revision"""
+    monkeypatch.setattr(settings, "REVISION_SNAPSHOT_INTERVAL", 3)
+    lines = [f"- change {i}: {'detail ' * 10}\n" for i in range(40)]
+    versions = ["".join(lines)]
+    changelog = Changelog(title="Release", content=versions[0], author="author", repository="o/r", commit_range="x")
+    db.add(changelog)
+    db.commit()
+
+    for i in range(7):
+        lines[i * 3] = f"- edited {i}\n"
+        content = "".join(lines)
+        # The last edit drops the trailing newline
+        versions.append(content if i < 6 else content.rstrip("\n"))
+        _edit(db, changelog, versions[-1])
+    return changelog, versions
+
+
+def test_snapshot_every_interval(db, history):
+    changelog, versions = history
+    rows = db.query(ChangelogRevision).filter(
+        ChangelogRevision.changelog_id == changelog.id
+    ).order_by(ChangelogRevision.revision).all()
+
+    assert [row.revision for row in rows] == list(range(1, len(versions) + 1))
+    assert [row.revision for row in rows if row.is_snapshot] == [1, 4, 7]
+    assert all(len(row.data) < len(versions[0]) / 2 for row in rows if not row.is_snapshot)
+
+
+def test_get_revision_reconstructs_every_version(db, history):
+    changelog, versions = history
+    for revision, content in enumerate(versions, start=1):
+        row, reconstructed = get_revision(db, changelog.id, revision)
+        assert row.revision == revision
+        assert reconstructed == content
+
+
+def test_get_revision_unknown(db, history):
+    changelog, versions = history
+    assert get_revision(db, changelog.id, len(versions) + 1) is None
+    assert get_revision(db, changelog.id + 1, 1) is None
@@ -0,0 +1,29 @@
+import pytest
+
+from static_publisher import _markdown_to_html, is_safe_url
+
+
+@pytest.mark.parametrize("content", [
+    "[x](javascript:alert(1))",
+    "![x](javascript:alert(1))",
+    "[x](JavaScript:alert(1))",
+    "[x](java\tscript:alert(1))",
+    "[x](&#106;avascript:alert(1))",
+    "[x](data:text/html,<script>alert(1)</script>)",
+    "[x][1]\n\n[1]: javascript:alert(1)",
+])
+def test_hostile_urls_are_dropped(content):
+    rendered = _markdown_to_html(content)
+    assert "javascript" not in rendered.lower()
+    assert "data:" not in rendered
+    assert "href" not in rendered and "src" not in rendered
+
+
+def test_raw_html_is_escaped():
+    assert "<script>" not in _markdown_to_html("<script>alert(1)</script>")
+
+
+@pytest.mark.parametrize("url", ["https://example.com", "http://example.com", "mailto:a@example.com", "/relative", "#anchor"])
+def test_safe_urls_are_kept(url):
+    assert is_safe_url(url)
+    assert f'href="{url}"' in _markdown_to_html(f"[x]({url})")
@@ -0,0 +1,71 @@
+import re
+
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel
+from starlette.testclient import TestClient
+
+import timing
+from timing import ServerTimingMiddleware, TimedRoute
+
+
+class Item(BaseModel):
+    name: str
+    tags: list[str] = []
+
+
+router = APIRouter(prefix="/items", route_class=TimedRoute)
+
+
+@router.post("")
+async def create_item(item: Item):
+    return {"name": item.name}
+
+
+@router.get("/sync")
+def sync_item():
+    return {"name": "sync"}
+
+
+recorded = []
+
+
+class RecordSpans:
+    """Keeps the raw span totals, which the Server-Timing header folds into validation"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+        recorded.append(dict(timing._spans.get() or {}))
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(RecordSpans)
+    app.add_middleware(ServerTimingMiddleware)
+    return TestClient(app)
+
+
+def parse_server_timing(header: str) -> dict:
+    spans = {}
+    for part in header.split(", "):
+        match = re.match(r'(\w+);dur=([\d.]+)(?:;desc="(\d+)x")?', part)
+        spans[match.group(1)] = (float(match.group(2)), int(match.group(3) or 1))
+    return spans
+
+
+def test_included_routes_are_timed_once():
+    response = make_client().post("/items", json={"name": "a", "tags": ["x"] * 200})
+    assert response.status_code == 200
+    assert recorded[-1]["handler"][1] == 1
+    assert parse_server_timing(response.headers["server-timing"])["validation"][0] > 0
+    endpoint = next(route.endpoint for route in make_client().app.routes if route.path == "/items")
+    assert endpoint.__wrapped__ is create_item
+
+
+def test_sync_endpoints_are_timed():
+    response = make_client().get("/items/sync")
+    assert response.json() == {"name": "sync"}
+    assert recorded[-1]["handler"][1] == 1
@@ -0,0 +1,204 @@
+import os
+import re
+import sys
+import time
+import random
+import asyncio
+import logging
+import threading
+import functools
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Callable
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-request span totals: name -> [total seconds, count]
+_spans: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("spans", default=None)
+
+
+def record_span(name: str, duration: float):
+    """Add a duration to the current request's span totals (no-op outside a request)"""
+    spans = _spans.get()
+    if spans is None:
+        return
+    entry = spans.get(name)
+    if entry is None:
+        spans[name] = [duration, 1]
+    else:
+        entry[0] += duration
+        entry[1] += 1
+
+
+@contextmanager
+def span(name: str):
+    """Time a block and add it to the current request's span totals"""
+    if _spans.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kw):
+            with span("handler"):
+                return await endpoint(*args, **kw)
+    else:
+        # Plain def endpoints keep running in the threadpool, as FastAPI would run them
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kw):
+            with span("handler"):
+                return await run_in_threadpool(endpoint, *args, **kw)
+
+    timed_endpoint.__timed__ = True
+    return timed_endpoint
+
+
+class TimedRoute(APIRoute):
+    """
+    API route that separates endpoint time from FastAPI's own work.
+
+    The endpoint runs inside a "handler" span and the full route (request
+    validation, dependencies, endpoint and response serialisation) inside a
+    "route" span; the difference is reported as "validation".
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # include_router rebuilds routes from their already wrapped endpoints
+        if not getattr(endpoint, "__timed__", False):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            with span("route"):
+                return await handler(request)
+
+        return timed_handler
+
+
+def _format_server_timing(spans: Dict[str, List[float]], total: float) -> str:
+    spans = dict(spans)
+    route = spans.pop("route", None)
+    handler = spans.pop("handler", None)
+    if route and handler:
+        spans["validation"] = [max(route[0] - handler[0], 0.0), 1]
+
+    parts = [
+        f'{name};dur={duration * 1000:.2f};desc="{int(count)}x"'
+        for name, (duration, count) in spans.items()
+    ]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack at a fixed interval and accumulates
+    collapsed stacks ("frame;frame;frame count") for flamegraph tools.
+
+    Requests share the event loop thread, so samples include any other
+    request running concurrently.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: StackCounter = StackCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _should_profile(headers: Dict[bytes, bytes]) -> bool:
+    if settings.PROFILE_HEADER_ENABLED and headers.get(b"x-profile") in (b"1", b"true"):
+        return True
+    return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def _write_profile(profiler: SamplingProfiler, method: str, path: str) -> str:
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    filename = os.path.join(settings.PROFILE_DIR, f"{int(time.time() * 1000)}-{method}-{slug}.collapsed")
+    profiler.write(filename)
+    return filename
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that collects spans for each request and returns their
+    totals in a Server-Timing header, optionally running the sampling profiler.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: Dict[str, List[float]] = {}
+        token = _spans.set(spans)
+        start = time.perf_counter()
+
+        profiler = None
+        if _should_profile(dict(scope["headers"])):
+            profiler = SamplingProfiler(threading.get_ident(), settings.PROFILE_INTERVAL_MS / 1000).start()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                header = _format_server_timing(spans, time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _spans.reset(token)
+            if profiler:
+                profiler.stop()
+                loop = asyncio.get_running_loop()
+                try:
+                    filename = await loop.run_in_executor(
+                        None, _write_profile, profiler, scope["method"], scope["path"]
+                    )
+                    logger.info(f"Wrote profile {filename}")
+                except OSError as e:
+                    logger.error(f"Failed to write profile: {str(e)}")
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, HTTPException, Request
+import hashlib
+import hmac
+import json
+from config import settings
+from commit_warmer import commit_warmer
+from timing import TimedRoute
+
+router = APIRouter(prefix="/api/v1/webhooks", tags=["Webhooks"], route_class=TimedRoute)
+
+
+def verify_signature(body: bytes, signature: str) -> bool:
+    """Check a GitHub X-Hub-Signature-256 header against the configured webhook secret"""
+    expected = "sha256=" + hmac.new(
+        settings.GITHUB_WEBHOOK_SECRET.encode(), body, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+@router.post("/github")
+async def github_webhook(request: Request):
+    """Receive GitHub push events and queue the pushed commits for cache warming"""
+    if not settings.GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(status_code=500, detail="GitHub webhook secret not configured")
+
+    body = await request.body()
+    signature = request.headers.get("X-Hub-Signature-256", "")
+    if not verify_signature(body, signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    event = request.headers.get("X-GitHub-Event", "")
+    if event == "ping":
+        return {"status": "success", "message": "pong"}
+    if event != "push":
+        return {"status": "ignored", "event": event}
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    # Branch deletions carry no new commits
+    if payload.get("deleted"):
+        return {"status": "ignored", "reason": "branch deleted"}
+
+    repository = payload.get("repository", {}).get("full_name")
+    if not repository:
+        raise HTTPException(status_code=400, detail="Push payload missing repository")
+
+    shas = [commit["id"] for commit in payload.get("commits", []) if commit.get("id")]
+    head = payload.get("head_commit") or {}
+    if head.get("id"):
+        shas.append(head["id"])
+
+    queued = await commit_warmer.enqueue(repository, shas)
+    return {
+        "status": "accepted",
+        "repository": repository,
+        "queued": queued
+    }
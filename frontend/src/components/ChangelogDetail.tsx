@@ -137,6 +137,7 @@ const ErrorMessage = styled.div`
 export const ChangelogDetail: React.FC = () => {
   const { id } = useParams<{ id: string }>();
   const [changelog, setChangelog] = useState<any>(null);
+  const [publishedHtml, setPublishedHtml] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
 
@@ -149,6 +150,12 @@ export const ChangelogDetail: React.FC = () => {
   const loadChangelog = async (changelogId: number) => {
     try {
       setLoading(true);
+      try {
+        setPublishedHtml(await apiService.getPublishedChangelogHtml(changelogId));
+        return;
+      } catch {
+        // Not published as static HTML (yet); render it from the API instead
+      }
       const response = await apiService.getChangelog(changelogId);
       setChangelog(response.changelog);
     } catch (error: any) {
@@ -176,6 +183,21 @@ export const ChangelogDetail: React.FC = () => {
     );
   }
 
+  if (publishedHtml !== null) {
+    return (
+      <Container>
+        <HeaderNav>
+          <BackLink to="/public">← Back to all changelogs</BackLink>
+          <DeveloperLink to="/">Developer View</DeveloperLink>
+        </HeaderNav>
+
+        <ChangelogCard>
+          <ChangelogContent dangerouslySetInnerHTML={{ __html: publishedHtml }} />
+        </ChangelogCard>
+      </Container>
+    );
+  }
+
   if (!changelog) {
     return (
       <Container>
@@ -277,7 +277,7 @@ export const PublicChangelogs: React.FC = () => {
   const loadPublicChangelogs = async () => {
     try {
       setLoading(true);
-      const response = await apiService.getChangelogs(true); // published only
+      const response = await apiService.getPublishedChangelogs();
       setChangelogs(response.changelogs || []);
     } catch (error: any) {
       console.error('Failed to load changelogs:', error);
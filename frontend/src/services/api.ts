@@ -66,6 +66,30 @@ export const apiService = {
     return response.data;
   },
 
+  async getPublishedChangelogs(): Promise<any> {
+    // Pre-rendered by the backend whenever a published changelog changes: index.json
+    // lists the repositories and each repository has its own index of changelogs.
+    // Fall back to the list API if it has not been generated yet
+    try {
+      const response = await api.get('/public/index.json');
+      const pages = await Promise.all(
+        response.data.repositories.map((repository: any) => api.get(repository.index))
+      );
+      const changelogs = pages
+        .flatMap((page) => page.data.changelogs)
+        .sort((a: any, b: any) => b.created_at.localeCompare(a.created_at));
+      return { status: 'success', changelogs };
+    } catch {
+      return this.getChangelogs(true);
+    }
+  },
+
+  async getPublishedChangelogHtml(id: number): Promise<string> {
+    // Rendered and sanitised by the backend when the changelog was published
+    const response = await api.get(`/public/changelogs/${id}.html`, { responseType: 'text' });
+    return response.data;
+  },
+
   async getChangelog(id: number): Promise<any> {
     const response = await api.get(`/api/v1/changelogs/${id}`);
     return response.data;
@@ -52,5 +52,6 @@ export interface Commit {
     deletions: number;
     changes: number;
     patch?: string;
+    filtered?: boolean;
   }>;
 }
\ No newline at end of file